@@ -0,0 +1,95 @@
+"""Bulk Parquet import and export of companies vs one ORM insert per company.
+
+Run against the database configured in `.env` (the rows are removed afterwards):
+
+    python -m benchmarks.bench_bulk_transfer            # 100,000 rows
+    python -m benchmarks.bench_bulk_transfer 1000000
+"""
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.parquet
+from sqlalchemy import delete
+
+from benchmarks.bench_upsert import make_records, per_card
+from db.database import async_session_maker, engine
+from db.models import Company
+from services.bulk_transfer import export_companies, import_companies
+from services.company_service import CompanyService
+
+ROWS = 100_000
+ORM_SAMPLE = 1_000
+
+
+def make_file(path: str, prefix: str, rows: int) -> None:
+    names = [f"{prefix}-{i}" for i in range(rows)]
+    pyarrow.parquet.write_table(pa.table({
+        "id": pa.array([None] * rows, pa.string()),
+        "name": names,
+        "location": ["San Francisco, CA, USA"] * rows,
+        "description": ["Benchmark company"] * rows,
+        "link": [f"https://www.ycombinator.com/companies/{name}" for name in names],
+        "normalized_name": names,
+        "source": ["ycombinator"] * rows,
+        "content_hash": pa.array([None] * rows, pa.string()),
+        "created_at": pa.array([datetime.datetime.now(datetime.UTC)] * rows, pa.timestamp("us", tz="UTC")),
+        "updated_at": pa.array([None] * rows, pa.timestamp("us", tz="UTC")),
+    }), path)
+
+
+async def orm_seconds_per_row(prefix: str) -> float:
+    records = make_records(prefix, ORM_SAMPLE)
+    start = time.perf_counter()
+    await per_card(CompanyService(async_session_maker), records)
+    seconds = time.perf_counter() - start
+    # The next asyncio.run() gets a new loop, which cannot reuse these pooled connections
+    await engine.dispose()
+    return seconds / ORM_SAMPLE
+
+
+async def cleanup(*prefixes: str) -> None:
+    async with async_session_maker() as session:
+        for prefix in prefixes:
+            await session.execute(delete(Company).where(Company.name.like(f"{prefix}-%")))
+        await session.commit()
+    await engine.dispose()
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    prefix, orm_prefix = f"bench-{uuid4().hex[:8]}", f"bench-{uuid4().hex[:8]}"
+    started = datetime.datetime.now(datetime.UTC)
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "companies.parquet")
+        make_file(source, prefix, rows)
+        try:
+            start = time.perf_counter()
+            inserted, _ = import_companies(source)
+            import_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            _, updated = import_companies(source)
+            reimport_seconds = time.perf_counter() - start
+
+            for file_format in ("parquet", "arrow"):
+                start = time.perf_counter()
+                exported = export_companies(os.path.join(directory, f"export.{file_format}"), created_from=started)
+                print(f"export {file_format:>7}: {exported:>9} rows in {time.perf_counter() - start:6.2f}s")
+
+            orm = asyncio.run(orm_seconds_per_row(orm_prefix))
+        finally:
+            asyncio.run(cleanup(prefix, orm_prefix))
+
+    print(f"import (new):       {inserted:>9} rows in {import_seconds:6.2f}s ({rows / import_seconds:,.0f} rows/s)")
+    print(f"import (unchanged): {updated:>9} updated in {reimport_seconds:6.2f}s")
+    print(f"create_new per row: {orm * 1000:.2f} ms -> {orm * rows:,.0f}s for {rows} rows (estimated from {ORM_SAMPLE})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Dashboard statistics from the company_daily_stats rollup vs aggregating the companies table.
+
+Inserts synthetic companies spread over a year inside one transaction, which is rolled back at the
+end, so nothing is left behind. For each table size it reports:
+- insert time with and without the rollup triggers;
+- the dashboard's daily counts computed in pandas over a full SELECT;
+- the same counts with GROUP BY over companies;
+- the same counts read from the rollup.
+
+Run against the database configured in `.env`:
+
+    python -m benchmarks.bench_daily_stats
+"""
+import asyncio
+import time
+
+import pandas as pd
+from sqlalchemy import text
+
+from db.database import engine
+
+SIZES = (10_000, 100_000)
+
+INSERT_COMPANIES = """
+    INSERT INTO companies (id, name, location, description, link, source, content_hash, created_at)
+    SELECT gen_random_uuid(), 'bench-stats-' || :offset + i, 'City ' || i % 50, 'Benchmark company',
+           'https://www.ycombinator.com/companies/bench-stats-' || :offset + i,
+           CASE WHEN i % 3 = 0 THEN 'linkedin' ELSE 'ycombinator' END, md5(i::text),
+           now() - (i % 365) * interval '1 day'
+    FROM generate_series(1, :count) AS i
+"""
+FULL_SELECT = "SELECT created_at, source, location FROM companies"
+GROUP_BY_COMPANIES = """
+    SELECT (created_at AT TIME ZONE 'UTC')::date AS day, source, count(*) AS companies
+    FROM companies GROUP BY 1, 2
+"""
+FROM_ROLLUP = "SELECT day, source, sum(companies) AS companies FROM company_daily_stats GROUP BY day, source"
+
+
+async def timed(connection, sql: str, **params) -> tuple[float, list]:
+    start = time.perf_counter()
+    result = await connection.execute(text(sql), params)
+    rows = result.all() if result.returns_rows else []
+    return time.perf_counter() - start, rows
+
+
+async def insert_time(connection, count: int, offset: int, triggers: bool) -> float:
+    savepoint = await connection.begin_nested()
+    if not triggers:
+        await connection.execute(text("ALTER TABLE companies DISABLE TRIGGER USER"))
+    elapsed, _ = await timed(connection, INSERT_COMPANIES, count=count, offset=offset)
+    await savepoint.rollback()
+    return elapsed
+
+
+async def main() -> None:
+    print(f"{'rows':>8} {'insert (s)':>11} {'no triggers (s)':>16} {'pandas (ms)':>12} "
+          f"{'GROUP BY (ms)':>14} {'rollup (ms)':>12} {'buckets':>8}")
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            inserted = 0
+            for size in SIZES:
+                with_triggers = await insert_time(connection, size - inserted, inserted, triggers=True)
+                without_triggers = await insert_time(connection, size - inserted, inserted, triggers=False)
+                await connection.execute(text(INSERT_COMPANIES), {"count": size - inserted, "offset": inserted})
+                inserted = size
+
+                start = time.perf_counter()
+                frame = pd.DataFrame((await connection.execute(text(FULL_SELECT))).all(), columns=["created_at", "source", "location"])
+                frame.groupby([frame["created_at"].dt.date, "source"]).size()
+                pandas_seconds = time.perf_counter() - start
+                group_by_seconds, _ = await timed(connection, GROUP_BY_COMPANIES)
+                rollup_seconds, buckets = await timed(connection, FROM_ROLLUP)
+
+                print(f"{size:>8} {with_triggers:>11.2f} {without_triggers:>16.2f} {pandas_seconds * 1000:>12.1f} "
+                      f"{group_by_seconds * 1000:>14.1f} {rollup_seconds * 1000:>12.1f} {len(buckets):>8}")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
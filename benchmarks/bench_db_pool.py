@@ -0,0 +1,83 @@
+"""Write latency percentiles as parallel writers grow, for several connection pool setups.
+
+Each writer saves small batches of new companies through `CompanyService.upsert_many`, the
+write-behind writer's path. Latency includes waiting for a pooled connection. Run against the
+database configured in `.env`:
+
+    python -m benchmarks.bench_db_pool
+"""
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from benchmarks.bench_upsert import make_records
+from db.database import DATABASE_URL, engine_options
+from db.models import Company
+from services.company_service import CompanyService
+
+WRITERS = (1, 4, 16, 64)
+BATCHES_PER_WRITER = 20
+BATCH_SIZE = 10
+
+
+def configurations() -> dict[str, dict]:
+    options = engine_options()
+    no_cache = {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+    return {
+        "no pool": {"poolclass": NullPool, "connect_args": options["connect_args"]},
+        "defaults (5+10)": {},
+        "settings": options,
+        "settings, no stmt cache": {**options, "connect_args": no_cache},
+    }
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[round(fraction * 100) - 1]
+
+
+async def run(options: dict, writers: int) -> tuple[float, list[float]]:
+    """Return wall seconds and per-batch latencies in milliseconds."""
+    engine = create_async_engine(DATABASE_URL, **options)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    service = CompanyService(session_maker)
+    prefix = f"bench-pool-{uuid4().hex[:8]}"
+    latencies = []
+
+    async def writer(number: int) -> None:
+        for batch in range(BATCHES_PER_WRITER):
+            records = make_records(f"{prefix}-{number}-{batch}", BATCH_SIZE)
+            start = time.perf_counter()
+            await service.upsert_many(records)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(number) for number in range(writers)))
+        elapsed = time.perf_counter() - start
+    finally:
+        async with session_maker() as session:
+            await session.execute(delete(Company).where(Company.name.like(f"{prefix}-%")))
+            await session.commit()
+        await engine.dispose()
+    return elapsed, latencies
+
+
+async def main() -> None:
+    print(f"{BATCHES_PER_WRITER} batches of {BATCH_SIZE} new companies per writer\n")
+    print(f"{'pool':<24} {'writers':>7} {'batches/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+    for label, options in configurations().items():
+        for writers in WRITERS:
+            elapsed, latencies = await run(options, writers)
+            print(
+                f"{label:<24} {writers:>7} {len(latencies) / elapsed:>10.0f} {percentile(latencies, 0.5):>9.1f} "
+                f"{percentile(latencies, 0.95):>9.1f} {percentile(latencies, 0.99):>9.1f} {max(latencies):>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""Company page enrichment against a local stand-in for the YC company pages.
+
+The stand-in serves synthetic company pages with a fixed latency and answers conditional requests
+with 304. No database or network access is needed:
+
+    python -m benchmarks.bench_enrichment
+"""
+import asyncio
+import html
+import json
+import tempfile
+import time
+from collections import Counter
+from uuid import uuid4
+
+from aiohttp import web
+
+from services.company_enricher import CompanyEnricher, EnrichmentTarget
+from services.http_cache import HttpCache
+
+COMPANIES = 200
+LATENCY = 0.05
+CONCURRENCY = (1, 8, 32)
+PAGE = '<html><body><div id="ShowPage-react-component" data-page="{}"></div></body></html>'
+
+
+def company_page(slug: str) -> str:
+    data = {"component": "Companies/ShowPage", "props": {"company": {
+        "name": slug,
+        "website": f"https://{slug}.example.com",
+        "team_size": len(slug),
+        "year_founded": 2024,
+        "founders": [{"full_name": f"Founder of {slug}"}],
+        "tags": ["B2B", "Fintech"],
+    }}}
+    return PAGE.format(html.escape(json.dumps(data)))
+
+
+async def start_site(responses: Counter) -> web.AppRunner:
+    async def show(request: web.Request) -> web.Response:
+        slug = request.match_info["slug"]
+        await asyncio.sleep(LATENCY)
+        etag = f'"{slug}-1"'
+        if request.headers.get("If-None-Match") == etag:
+            responses[304] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        responses[200] += 1
+        return web.Response(text=company_page(slug), content_type="text/html", headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/companies/{slug}", show)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+async def measure(enricher: CompanyEnricher, targets: list[EnrichmentTarget], refresh: bool) -> tuple[float, int]:
+    start = time.perf_counter()
+    rows = await enricher.fetch_all(targets, refresh)
+    return time.perf_counter() - start, len(rows)
+
+
+async def main() -> None:
+    responses = Counter()
+    runner = await start_site(responses)
+    port = runner.addresses[0][1]
+    targets = [EnrichmentTarget(uuid4(), f"http://127.0.0.1:{port}/companies/company-{i}") for i in range(COMPANIES)]
+    print(f"{COMPANIES} pages, {LATENCY * 1000:.0f} ms latency each")
+    print(f"{'concurrency':>11} {'pass':>7} {'seconds':>8} {'pages/s':>8} {'200':>5} {'304':>5} {'parsed':>7}")
+
+    try:
+        for concurrency in CONCURRENCY:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                enricher = CompanyEnricher(None, HttpCache(cache_dir), concurrency=concurrency)
+                try:
+                    for label, refresh in (("cold", False), ("refresh", True)):
+                        responses.clear()
+                        seconds, parsed = await measure(enricher, targets, refresh)
+                        print(f"{concurrency:>11} {label:>7} {seconds:>8.2f} {COMPANIES / seconds:>8.0f} "
+                              f"{responses[200]:>5} {responses[304]:>5} {parsed:>7}")
+                finally:
+                    await enricher.close()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""Job queue throughput with 1, 2 and 4 worker processes sharing the jobs table.
+
+Every job sleeps for a fixed time, standing in for a crawl or a page fetch. The benchmark checks
+that each job ran exactly once, and that jobs leased by a worker that died are picked up again
+once their lease expires. Run against the database configured in `.env`:
+
+    python -m benchmarks.bench_job_queue
+"""
+import asyncio
+import multiprocessing
+import time
+from datetime import datetime, UTC
+from collections import Counter
+from uuid import uuid4
+
+from sqlalchemy import delete, insert
+
+from db.dao.job_dao import JobDAO
+from db.database import async_session_maker, engine
+from db.models import Job
+from services.job_worker import JobWorker
+
+KIND = "bench"
+JOBS = 400
+JOB_SECONDS = 0.02
+CONCURRENCY = 4
+PROCESSES = (1, 2, 4)
+STARTUP_SECONDS = 5.0
+
+
+async def enqueue(prefix: str, count: int) -> None:
+    async with async_session_maker() as session:
+        await session.execute(insert(Job), [
+            {"kind": KIND, "key": f"{prefix}:{i}", "payload": {}, "run_at": datetime.now(UTC), "attempts": 0}
+            for i in range(count)
+        ])
+        await session.commit()
+    # Each asyncio.run() has its own loop; pooled connections cannot be reused across loops
+    await engine.dispose()
+
+
+async def cleanup(prefix: str) -> None:
+    async with async_session_maker() as session:
+        await session.execute(delete(Job).where(Job.key.like(f"{prefix}:%")))
+        await session.commit()
+    await engine.dispose()
+
+
+async def drain(lease_seconds: float, start_at: float) -> tuple[list[str], float]:
+    """Run a worker from `start_at` until no job is due. Return the keys of the jobs it ran and the end time."""
+    done = []
+    # All processes start together, after their imports and start-up
+    await asyncio.sleep(max(0.0, start_at - time.time()))
+
+    async def handler(job: Job) -> None:
+        await asyncio.sleep(JOB_SECONDS)
+        done.append(job.key)
+
+    await JobWorker(async_session_maker, {KIND: handler}, concurrency=CONCURRENCY, lease_seconds=lease_seconds).run(until_idle=True)
+    end = time.time()
+    await engine.dispose()
+    return done, end
+
+
+def worker_process(args: tuple[float, float]) -> tuple[list[str], float]:
+    return asyncio.run(drain(*args))
+
+
+def run_workers(processes: int, lease_seconds: float = 60.0) -> tuple[float, Counter]:
+    start_at = time.time() + STARTUP_SECONDS
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        results = pool.map(worker_process, [(lease_seconds, start_at)] * processes)
+    elapsed = max(end for _, end in results) - start_at
+    return elapsed, Counter(key for keys, _ in results for key in keys)
+
+
+async def abandon(prefix: str, count: int, lease_seconds: float) -> None:
+    """Claim jobs as a worker that then dies without finishing them."""
+    await enqueue(prefix, count)
+    async with async_session_maker() as session:
+        await JobDAO(session).claim(f"dead-{prefix}", [KIND], count, lease_seconds)
+    await engine.dispose()
+
+
+def main() -> None:
+    print(f"{JOBS} jobs of {JOB_SECONDS * 1000:.0f} ms, {CONCURRENCY} jobs at a time per process")
+    print(f"{'processes':>9} {'seconds':>8} {'jobs/s':>7} {'ran once':>9} {'ran twice+':>11}")
+    for processes in PROCESSES:
+        prefix = f"bench-{uuid4().hex[:8]}"
+        asyncio.run(enqueue(prefix, JOBS))
+        try:
+            elapsed, runs = run_workers(processes)
+        finally:
+            asyncio.run(cleanup(prefix))
+        once = sum(1 for count in runs.values() if count == 1)
+        print(f"{processes:>9} {elapsed:>8.2f} {JOBS / elapsed:>7.0f} {once:>9} {len(runs) - once:>11}")
+
+    prefix = f"bench-{uuid4().hex[:8]}"
+    lease_seconds = STARTUP_SECONDS * 2
+    asyncio.run(abandon(prefix, 20, lease_seconds))
+    expires = time.time() + lease_seconds
+    try:
+        _, before = run_workers(1)
+        time.sleep(max(0.0, expires - time.time()))
+        _, after = run_workers(1)
+    finally:
+        asyncio.run(cleanup(prefix))
+    print(f"abandoned jobs run while leased: {sum(before.values())}, after the lease expired: {sum(after.values())}/20")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Event loop lag while parsing large pages inline vs in a process pool.
+
+    python -m benchmarks.bench_loop_lag
+"""
+import asyncio
+import time
+
+from benchmarks.bench_parsers import BASE_URL
+from benchmarks.synthetic import yc_page
+from services.loop_lag import LoopLagMonitor
+from services.parse_executor import ParseExecutor
+
+CARDS = 5_000
+PAGES = 8
+
+
+async def run(workers: int) -> tuple[float, dict]:
+    yc_html = yc_page(CARDS)
+    executor = ParseExecutor("auto", workers)
+    monitor = LoopLagMonitor(interval=0.01, window=100_000)
+    try:
+        # Warm the pool so process start-up is not counted
+        await executor.parse_yc("", BASE_URL)
+
+        async def sample_forever():
+            while True:
+                await monitor.sample()
+
+        sampler = asyncio.create_task(sample_forever())
+        start = time.perf_counter()
+        await asyncio.gather(*(executor.parse_yc(yc_html, BASE_URL) for _ in range(PAGES)))
+        elapsed = time.perf_counter() - start
+        # Let the sampler observe the tail of a blocked loop before stopping it
+        await asyncio.sleep(monitor.interval * 2)
+        sampler.cancel()
+    finally:
+        executor.shutdown()
+    return elapsed, monitor.stats()
+
+
+async def main() -> None:
+    print(f"Parsing {PAGES} pages of {CARDS} cards\n")
+    print(f"{'workers':>8} {'wall (s)':>9} {'lag p50 (ms)':>13} {'lag p99 (ms)':>13} {'lag max (ms)':>13}")
+    for workers in (0, 2, 4):
+        elapsed, stats = await run(workers)
+        print(f"{workers:>8} {elapsed:>9.2f} {stats['p50']:>13.1f} {stats['p99']:>13.1f} {stats['max']:>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
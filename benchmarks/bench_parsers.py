@@ -0,0 +1,60 @@
+"""Check that every installed HTML parser backend extracts the same records, then measure throughput.
+
+    python -m benchmarks.bench_parsers
+"""
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import linkedin_page, yc_page
+from services.html_parsers import available_backends, get_parser
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+BASE_URL = "https://www.ycombinator.com"
+SIZES = (100, 1_000, 10_000)
+
+
+def check_equivalence() -> bool:
+    """Compare every backend with the bs4 reference on the fixture pages."""
+    yc_html = (FIXTURES / "yc_companies.html").read_text()
+    linkedin_html = (FIXTURES / "linkedin_companies.html").read_text()
+
+    reference = get_parser("bs4")
+    expected_yc = reference.parse_yc(yc_html, BASE_URL)
+    expected_linkedin = reference.parse_linkedin(linkedin_html)
+
+    ok = True
+    for backend in available_backends():
+        parser = get_parser(backend)
+        same_yc = parser.parse_yc(yc_html, BASE_URL) == expected_yc
+        same_linkedin = parser.parse_linkedin(linkedin_html) == expected_linkedin
+        print(f"{backend:>10}: yc={'ok' if same_yc else 'MISMATCH'} linkedin={'ok' if same_linkedin else 'MISMATCH'}")
+        ok = ok and same_yc and same_linkedin
+    return ok
+
+
+def cards_per_second(parse, html: str, size: int) -> float:
+    repeats = max(1, 2_000 // size)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        parse(html)
+    return size * repeats / (time.perf_counter() - start)
+
+
+def main() -> int:
+    if not check_equivalence():
+        return 1
+
+    print(f"\n{'backend':>10} {'cards':>7} {'yc cards/s':>12} {'linkedin cards/s':>17}")
+    for size in SIZES:
+        yc_html, linkedin_html = yc_page(size), linkedin_page(size)
+        for backend in available_backends():
+            parser = get_parser(backend)
+            yc_rate = cards_per_second(lambda html: parser.parse_yc(html, BASE_URL), yc_html, size)
+            linkedin_rate = cards_per_second(parser.parse_linkedin, linkedin_html, size)
+            print(f"{backend:>10} {size:>7} {yc_rate:>12.0f} {linkedin_rate:>17.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
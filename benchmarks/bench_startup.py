@@ -0,0 +1,85 @@
+"""Cold start time of the command line, measured with `python -X importtime`.
+
+Each command is started several times in a fresh interpreter. Reports the median wall time and
+import time and the slowest top-level imports. Fails if a command loads a module it has no use for
+(Playwright, SQLAlchemy, pandas, ...) or if its median import time passes the budget:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --max-import-ms 150
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("playwright", "sqlalchemy", "asyncpg", "pandas", "pyarrow", "adbc_driver_postgresql", "bs4", "aiohttp", "streamlit")
+# Commands that only parse arguments; none of them should load the heavy modules
+COMMANDS = (
+    ("--help",),
+    ("crawl", "--help"),
+    ("worker", "--help"),
+    ("export", "--help"),
+)
+RUNS = 5
+TOP_IMPORTS = 5
+
+
+def run_command(args: tuple[str, ...]) -> tuple[float, dict[str, int], dict[str, int]]:
+    """Start main.py once. Return wall seconds, top-level imports and all imports with cumulative microseconds."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=ROOT, capture_output=True, text=True, env=os.environ.copy(), check=True
+    )
+    wall = time.perf_counter() - start
+
+    top_level, imported = {}, {}
+    # Lines look like "import time:   self [us] |  cumulative | <indented module name>"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imported[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):
+            top_level[name.strip()] = int(cumulative)
+    return wall, top_level, imported
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--runs", type=int, default=RUNS)
+    arg_parser.add_argument("--max-import-ms", type=float, default=250.0,
+                            help="fail if a command's median import time is above this (default: 250)")
+    args = arg_parser.parse_args()
+
+    failed = False
+    print(f"{'command':<22} {'wall p50 (ms)':>14} {'imports p50 (ms)':>17}  slowest imports")
+    for command in COMMANDS:
+        walls, import_times = [], []
+        for _ in range(args.runs):
+            wall, top_level, imported = run_command(command)
+            walls.append(wall * 1000)
+            import_times.append(sum(top_level.values()) / 1000)
+
+        slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+        slowest_text = ", ".join(f"{name} {micros / 1000:.0f}ms" for name, micros in slowest)
+        import_ms = statistics.median(import_times)
+        print(f"{' '.join(command):<22} {statistics.median(walls):>14.0f} {import_ms:>17.0f}  {slowest_text}")
+
+        heavy = sorted({name.split(".")[0] for name in imported} & set(HEAVY_MODULES))
+        if heavy:
+            print(f"  FAIL: loads {', '.join(heavy)}")
+            failed = True
+        if import_ms > args.max_import_ms:
+            print(f"  FAIL: imports take {import_ms:.0f}ms, budget {args.max_import_ms:.0f}ms")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Offline benchmark of the scraper's parse-and-save hot path on synthetic pages.
+
+Runs `StreamScraperService.parse_page` and `parse_page_linkedin` against an in-memory stub
+`CompanyService`, so no browser, network or database is needed. Records the best and median wall
+time of repeated runs after a warm-up run, peak traced memory, and the size and number of memory
+blocks a run leaves allocated, for each page size, and compares the best times with a JSON baseline:
+
+    python -m benchmarks.bench_suite                    # compare with benchmarks/baseline.json
+    python -m benchmarks.bench_suite --write-baseline   # record a new baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Iterable
+
+# The scraper imports config, which requires DB settings; none of them are used offline
+for _name, _value in (("DB_HOST", "localhost"), ("DB_PORT", "5432"), ("DB_NAME", "bench"),
+                      ("DB_USER", "bench"), ("DB_PASSWORD", "bench")):
+    os.environ.setdefault(_name, _value)
+
+from benchmarks.synthetic import linkedin_page, yc_page  # noqa: E402
+from services.parse_executor import ParseExecutor  # noqa: E402
+from services.records import CompanyRecord  # noqa: E402
+from services.stream_scraper_service import StreamScraperService  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+SIZES = (50, 500, 5_000, 50_000)
+REPEATS = 5
+# Small pages are repeated until they have run this long, so one slow run cannot decide the result
+MIN_TIMED_S = 1.0
+
+
+class StubCompanyService:
+    """In-memory stand-in for CompanyService: remembers names and reports the new ones."""
+
+    def __init__(self):
+        self.known_index = None
+        self.names: set[str] = set()
+
+    def filter_unknown(self, records: Iterable[CompanyRecord]) -> list[CompanyRecord]:
+        return [record for record in records if record.name not in self.names]
+
+    async def upsert_many(self, records: Iterable[CompanyRecord], skip_known: bool = True) -> list[CompanyRecord]:
+        created = []
+        for record in records:
+            if record.name not in self.names:
+                self.names.add(record.name)
+                created.append(record)
+        return created
+
+
+def measure(source: str, size: int, backend: str, repeats: int = REPEATS) -> dict:
+    html = yc_page(size) if source == "ycombinator" else linkedin_page(size)
+    # The scraper, its parse executor and browser pool and the event loop are set up once, outside
+    # the timed runs. Every run gets an empty stub, so all its companies are new.
+    scraper = StreamScraperService(StubCompanyService(), [], parse_executor=ParseExecutor(backend))
+    parse = scraper.parse_page if source == "ycombinator" else scraper.parse_page_linkedin
+
+    with asyncio.Runner() as runner:
+        def run() -> int:
+            scraper.company_service = StubCompanyService()
+            return runner.run(parse(html))
+
+        # Timing runs without tracemalloc, which slows allocation-heavy code down several times.
+        # The warm-up run fills import, parser and allocator caches. Noise only ever adds time,
+        # so the best run is the statistic compared with the baseline.
+        new_companies = run()
+        walls = []
+        while len(walls) < repeats or sum(walls) < MIN_TIMED_S:
+            start = time.perf_counter()
+            run()
+            walls.append(time.perf_counter() - start)
+        wall = min(walls)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    # Net change between the snapshots: what the run left allocated, such as the saved records
+    retained = after.compare_to(before, "filename")
+
+    return {
+        "cards": size,
+        "new_companies": new_companies,
+        "wall_min_s": round(wall, 5),
+        "wall_p50_s": round(statistics.median(walls), 5),
+        "repeats": len(walls),
+        "cards_per_s": round(size / wall),
+        "peak_kib": round(peak / 1024),
+        "retained_kib": round(sum(stat.size_diff for stat in retained) / 1024),
+        "retained_blocks": sum(stat.count_diff for stat in retained),
+    }
+
+
+def run_suite(sizes: Iterable[int], backend: str, repeats: int = REPEATS) -> dict:
+    results = {}
+    for source in ("ycombinator", "linkedin"):
+        for size in sizes:
+            results[f"{source}/{size}"] = measure(source, size, backend, repeats)
+    return results
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> bool:
+    """Print the change in best wall time against the baseline. Return False if any regressed too much."""
+    ok = True
+    print(f"{'case':>18} {'best (s)':>9} {'baseline':>9} {'change':>8} {'p50 (s)':>9} {'runs':>5} {'peak KiB':>9} {'baseline':>9}")
+    for case, result in results.items():
+        base = baseline.get(case)
+        timings = f"{result['wall_p50_s']:>9.4f} {result['repeats']:>5}"
+        if base is None or "wall_min_s" not in base:
+            # Missing, or recorded from a single run before repeated timing
+            print(f"{case:>18} {result['wall_min_s']:>9.4f} {'-':>9} {'new':>8} {timings} {result['peak_kib']:>9} {'-':>9}")
+            continue
+        change = (result["wall_min_s"] - base["wall_min_s"]) / base["wall_min_s"] * 100
+        flag = ""
+        if change > max_regression:
+            ok = False
+            flag = "  REGRESSION"
+        print(f"{case:>18} {result['wall_min_s']:>9.4f} {base['wall_min_s']:>9.4f} {change:>+7.1f}% "
+              f"{timings} {result['peak_kib']:>9} {base['peak_kib']:>9}{flag}")
+    return ok
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--backend", default="auto", help="HTML parser backend (default: auto)")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="cards per page")
+    arg_parser.add_argument("--repeats", type=int, default=REPEATS,
+                            help=f"timed runs per case, more for small pages (default: at least {REPEATS})")
+    arg_parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    arg_parser.add_argument("--write-baseline", action="store_true", help="store the results as the new baseline")
+    arg_parser.add_argument("--max-regression", type=float, default=25.0,
+                            help="fail if a best wall time is this many percent slower than the baseline")
+    args = arg_parser.parse_args()
+
+    backend = ParseExecutor(args.backend).parser.name
+    results = run_suite(args.sizes, backend, args.repeats)
+
+    if args.write_baseline:
+        document = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": backend,
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        print(json.dumps(results, indent=2))
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(json.dumps(results, indent=2))
+        print(f"No baseline at {args.baseline}; run with --write-baseline to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("backend") != backend:
+        print(f"Note: baseline was recorded with the {baseline.get('backend')} backend, this run uses {backend}")
+    return 0 if compare(results, baseline["results"], args.max_regression) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Compare per-card lookup-then-insert with the batched upsert path.
+
+Run against the database configured in `.env`:
+
+    python -m benchmarks.bench_upsert
+"""
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete
+
+from db.database import async_session_maker, engine
+from db.models import Company
+from services.company_service import CompanyService
+from services.records import CompanyRecord
+
+SIZES = (100, 1_000, 10_000)
+
+
+def make_records(prefix: str, count: int) -> list[CompanyRecord]:
+    return [
+        CompanyRecord(
+            name=f"{prefix}-{i}",
+            location="San Francisco, CA, USA",
+            description="Benchmark company",
+            link=f"https://www.ycombinator.com/companies/{prefix}-{i}",
+            source="ycombinator",
+        )
+        for i in range(count)
+    ]
+
+
+async def per_card(service: CompanyService, records: list[CompanyRecord]) -> int:
+    """The previous path: one lookup and one committed insert per card."""
+    new_count = 0
+    for record in records:
+        if not await service.get_by_name(record.name):
+            await service.create_new(*record)
+            new_count += 1
+    return new_count
+
+
+async def batched(service: CompanyService, records: list[CompanyRecord]) -> int:
+    return len(await service.upsert_many(records))
+
+
+async def cleanup(prefix: str) -> None:
+    async with async_session_maker() as session:
+        await session.execute(delete(Company).where(Company.name.like(f"{prefix}-%")))
+        await session.commit()
+
+
+async def measure(service: CompanyService, path, records: list[CompanyRecord]) -> tuple[float, float]:
+    """Return seconds for a cold pass (all new) and a warm pass (all existing)."""
+    start = time.perf_counter()
+    await path(service, records)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await path(service, records)
+    warm = time.perf_counter() - start
+    return cold, warm
+
+
+async def main() -> None:
+    service = CompanyService(async_session_maker)
+    print(f"{'cards':>7} {'path':>9} {'new (s)':>9} {'existing (s)':>13} {'cards/s':>9}")
+
+    for size in SIZES:
+        for label, path in (("per-card", per_card), ("batched", batched)):
+            prefix = f"bench-{uuid4().hex[:8]}"
+            try:
+                cold, warm = await measure(service, path, make_records(prefix, size))
+            finally:
+                await cleanup(prefix)
+            print(f"{size:>7} {label:>9} {cold:>9.3f} {warm:>13.3f} {size / cold:>9.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Synthetic Y Combinator directory and LinkedIn search pages in the markup the parsers expect."""
+import random
+from html import escape
+
+LOCATIONS = (
+    "San Francisco, CA, USA", "New York, NY, USA", "Berlin, Germany", "London, United Kingdom",
+    "Paris, Île-de-France", "Bengaluru, KA, India", "Remote", "São Paulo, Brazil",
+)
+INDUSTRIES = ("Software Development", "Financial Services", "IT Services", "Biotechnology Research", "Robotics")
+WORDS = (
+    "AI", "agents", "for", "fintech", "compliance", "robots", "warehouse", "developer", "tools", "health",
+    "payments", "open-source", "infrastructure", "B2B", "climate", "security", "data", "&", "SMBs", "teams",
+)
+
+YC_CARD = """
+<a href="/companies/{slug}" class="_company_i9oky_355" target="_blank">
+  <div class="relative flex w-full items-center justify-start">
+    <div class="flex w-20 shrink-0 grow-0 basis-20 items-center pr-4"><img src="/logos/{slug}.png" alt="{name}" class="rounded-full"></div>
+    <div class="flex flex-1 items-center justify-between">
+      <div class="lg:max-w-[90%]">
+        <div><span class="_coName_i9oky_470">{name}</span>{location}</div>
+        <div class="mb-1.5 text-sm"><span>{description}</span></div>
+        <div class="_pillWrapper_i9oky_33"><span class="pill _pill_i9oky_33">{batch}</span></div>
+      </div>
+    </div>
+  </div>
+</a>"""
+
+YC_LOCATION = '<span class="_coLocation_i9oky_486">{location}</span>'
+
+LINKEDIN_CARD = """
+<li class="reusable-search__result-container">
+  <div class="entity-result">
+    <div class="entity-result__content">
+      <div class="t-roman t-sans"><a class="app-aware-link" href="https://www.linkedin.com/company/{slug}/">{name} (YC {batch_code})</a></div>
+      <div class="entity-result__primary-subtitle t-14 t-black t-normal">{industry} • {location}</div>
+      <div class="entity-result__secondary-subtitle t-14 t-normal">{followers} followers</div>
+      {description}
+    </div>
+  </div>
+</li>"""
+
+LINKEDIN_DESCRIPTION = '<p class="entity-result__summary entity-result__summary--2-lines t-12 t-black--light">{description}</p>'
+
+
+def _company(rng: random.Random, i: int) -> dict:
+    name = f"{rng.choice(WORDS).capitalize()}{rng.choice(WORDS).capitalize()} {i}"
+    return {
+        "name": escape(name),
+        "slug": f"company-{i}",
+        "location": escape(rng.choice(LOCATIONS)),
+        "description": escape(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14)))),
+    }
+
+
+def yc_page(cards: int, seed: int = 0) -> str:
+    """A YC directory page with `cards` company cards; about 5% of cards lack a location."""
+    rng = random.Random(seed)
+    body = []
+    for i in range(cards):
+        company = _company(rng, i)
+        location = YC_LOCATION.format(**company) if rng.random() > 0.05 else ""
+        body.append(YC_CARD.format(**{**company, "location": location, "batch": "Spring 2025"}))
+    return ('<!DOCTYPE html><html><head><title>Startup Directory | Y Combinator</title></head><body>'
+            '<div class="_section_i9oky_163 _results_i9oky_343">' + "".join(body) + "</div></body></html>")
+
+
+def linkedin_page(cards: int, seed: int = 0) -> str:
+    """A LinkedIn company search page with `cards` results; about 10% have no summary."""
+    rng = random.Random(seed)
+    body = []
+    for i in range(cards):
+        company = _company(rng, i)
+        description = LINKEDIN_DESCRIPTION.format(**company) if rng.random() > 0.1 else ""
+        body.append(LINKEDIN_CARD.format(**{
+            **company,
+            "description": description,
+            "batch_code": "S25",
+            "industry": rng.choice(INDUSTRIES),
+            "followers": rng.randint(10, 5000),
+        }))
+    return ('<!DOCTYPE html><html><head><title>Search | LinkedIn</title></head><body>'
+            '<div class="search-results-container"><ul role="list" class="reusable-search__entity-result-list list-style-none">'
+            + "".join(body) + "</ul></div></body></html>")
@@ -1,21 +1,294 @@
-import streamlit as st
+import asyncio
+import datetime
+import threading
+from contextlib import closing
+from typing import Optional
+
 import pandas as pd
+import pyarrow as pa
+import streamlit as st
 from adbc_driver_postgresql import dbapi
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.pool import QueuePool
 from config import settings
+from db.dao.company_dao import CompanyDAO, CompanyFilters
+from db.database import async_session_maker
+
+COLUMNS = "name, location, description, link, created_at, updated_at"
+# The incremental reload watermark is the latest value of each, so both filters can use their index
+WATERMARK_COLUMNS = ("created_at", "updated_at")
+# Timestamps come from now(), the transaction start, so a write that commits after the watermark was read
+# can carry older ones. Reloads read this far behind the watermark and drop the rows they have already seen.
+WATERMARK_OVERLAP = datetime.timedelta(seconds=30)
+SORT_COLUMNS = {"Created": "created_at", "Updated": "updated_at", "Name": "name", "Location": "location"}
+SOURCES = {"Y Combinator": "ycombinator", "LinkedIn": "linkedin"}
+PAGE_SIZES = (25, 50, 100, 500)
+
+
+def ping(dbapi_connection, connection_record, connection_proxy) -> None:
+    """Check a pooled connection before use; the pool replaces it if the server dropped it."""
+    try:
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+    except dbapi.Error as e:
+        raise DisconnectionError() from e
+
+
+@st.cache_resource
+def adbc_pool() -> QueuePool:
+    """ADBC connections shared by all sessions, sized and recycled like the crawler's engine pool."""
+    pool = QueuePool(
+        # Autocommit, so an idle pooled connection does not hold a transaction open
+        lambda: dbapi.connect(settings.get_db_uri(), autocommit=True),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        timeout=settings.DB_POOL_TIMEOUT,
+        recycle=settings.DB_POOL_RECYCLE,
+        reset_on_return=None,
+    )
+    if settings.DB_POOL_PRE_PING:
+        event.listen(pool, "checkout", ping)
+    return pool
+
+
+def query_arrow(sql: str, params: tuple = ()) -> pa.Table:
+    """Run `sql` with $n parameters and fetch the result as one Arrow table."""
+    with closing(adbc_pool().connect()) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetch_arrow_table()
+
+
+def escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_filters(
+    location: str,
+    created_from: Optional[datetime.datetime],
+    created_to: Optional[datetime.datetime],
+    source: str
+) -> tuple[list[str], list]:
+    """WHERE conditions and their parameters for the sidebar filters."""
+    conditions, params = [], []
+
+    def add(condition: str, value) -> None:
+        params.append(value)
+        conditions.append(condition.format(f"${len(params)}"))
+
+    if location:
+        add("location ILIKE {}", f"%{escape_like(location)}%")
+    if created_from is not None:
+        add("created_at >= {}", created_from)
+    if created_to is not None:
+        add("created_at < {}", created_to)
+    if source in SOURCES:
+        add("EXISTS (SELECT 1 FROM company_sources s WHERE s.company_id = companies.id AND s.source = {})", SOURCES[source])
+    return conditions, params
+
+
+def build_stats_filters(
+    location: str,
+    created_from: Optional[datetime.datetime],
+    created_to: Optional[datetime.datetime],
+    source: str
+) -> tuple[list[str], list]:
+    """The sidebar filters for the company_daily_stats rollup, which has UTC days and the creating source."""
+    conditions, params = [], []
+
+    def add(condition: str, value) -> None:
+        params.append(value)
+        conditions.append(condition.format(f"${len(params)}"))
+
+    if location:
+        add("location ILIKE {}", f"%{escape_like(location)}%")
+    if created_from is not None:
+        add("day >= {}", created_from.date())
+    if created_to is not None:
+        add("day < {}", created_to.date())
+    if source in SOURCES:
+        add("source = {}", SOURCES[source])
+    return conditions, params
+
+
+def where_clause(conditions: list[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def order_clause(sort_column: str, descending: bool) -> str:
+    direction = "DESC" if descending else "ASC"
+    return f"ORDER BY {sort_column} {direction}" + (", name" if sort_column != "name" else "")
+
+
+Watermark = tuple[Optional[datetime.datetime], Optional[datetime.datetime]]
+
+
+def load_watermark() -> Watermark:
+    """Latest created_at and updated_at; each max() is read off the end of its index."""
+    latest = query_arrow(f"SELECT {', '.join(f'max({column}) AS {column}' for column in WATERMARK_COLUMNS)} FROM companies")
+    return tuple(latest[column][0].as_py() for column in WATERMARK_COLUMNS)
+
+
+def count_rows(conditions: list[str], params: list) -> int:
+    return query_arrow(f"SELECT count(*) AS total FROM companies {where_clause(conditions)}", tuple(params))["total"][0].as_py()
+
+
+def load_page(conditions: list[str], params: list, sort_column: str, descending: bool, page: int, page_size: int) -> pd.DataFrame:
+    n = len(params)
+    sql = (f"SELECT {COLUMNS} FROM companies {where_clause(conditions)} "
+           f"{order_clause(sort_column, descending)} LIMIT ${n + 1} OFFSET ${n + 2}")
+    return query_arrow(sql, (*params, page_size, (page - 1) * page_size)).to_pandas()
+
+
+def load_changes(conditions: list[str], params: list, watermark: Watermark) -> pd.DataFrame:
+    """Rows matching the filters that were inserted or updated after `watermark`, less `WATERMARK_OVERLAP`."""
+    params = list(params)
+    since = []
+    for column, value in zip(WATERMARK_COLUMNS, watermark):
+        if value is None:
+            since.append(f"{column} IS NOT NULL")
+        else:
+            params.append(value - WATERMARK_OVERLAP)
+            since.append(f"{column} > ${len(params)}")
+    changed = [*conditions, f"({' OR '.join(since)})"]
+    return query_arrow(f"SELECT {COLUMNS} FROM companies {where_clause(changed)}", tuple(params)).to_pandas()
+
+
+def row_versions(changes: pd.DataFrame) -> frozenset:
+    """Name and timestamps of every row in `changes`, to tell rows read again from new ones."""
+    return frozenset(changes[["name", *WATERMARK_COLUMNS]].astype(str).itertuples(index=False, name=None))
+
+
+def drop_seen(changes: pd.DataFrame, seen: frozenset) -> pd.DataFrame:
+    """`changes` without the row versions in `seen`."""
+    versions = changes[["name", *WATERMARK_COLUMNS]].astype(str).itertuples(index=False, name=None)
+    return changes[[version not in seen for version in versions]]
+
+
+def advance_watermark(watermark: Watermark, changes: pd.DataFrame) -> Watermark:
+    """`watermark` moved past the rows in `changes`."""
+    advanced = []
+    for column, value in zip(WATERMARK_COLUMNS, watermark):
+        latest = changes[column].max()
+        if not pd.isna(latest) and (value is None or latest.to_pydatetime() > value):
+            value = latest.to_pydatetime()
+        advanced.append(value)
+    return tuple(advanced)
+
+
+def load_daily_counts(conditions: list[str], params: list) -> pd.DataFrame:
+    """New companies per day, one column per source, read from the rollup."""
+    sql = (f"SELECT day, source, sum(companies) AS companies FROM company_daily_stats {where_clause(conditions)} "
+           "GROUP BY day, source ORDER BY day")
+    counts = query_arrow(sql, tuple(params)).to_pandas()
+    return counts.pivot_table(index="day", columns="source", values="companies", aggfunc="sum", fill_value=0)
+
+
+def load_top_locations(conditions: list[str], params: list, limit: int = 10) -> pd.DataFrame:
+    n = len(params)
+    sql = (f"SELECT location, sum(companies) AS companies FROM company_daily_stats {where_clause(conditions)} "
+           f"GROUP BY location HAVING sum(companies) > 0 ORDER BY companies DESC, location LIMIT ${n + 1}")
+    return query_arrow(sql, (*params, limit)).to_pandas().set_index("location")
+
+
+def merge_changes(frame: pd.DataFrame, changes: pd.DataFrame, sort_column: str, descending: bool, page_size: int) -> pd.DataFrame:
+    """Merge changed rows into the first page and keep it in SQL order."""
+    merged = pd.concat([frame[~frame["name"].isin(changes["name"])], changes[frame.columns]], ignore_index=True)
+    by, ascending = ([sort_column], [not descending]) if sort_column == "name" else ([sort_column, "name"], [not descending, True])
+    # Postgres puts NULLs first in DESC order and last in ASC order
+    merged = merged.sort_values(by, ascending=ascending, na_position="first" if descending else "last")
+    return merged.head(page_size).reset_index(drop=True)
+
+
+@st.cache_resource
+def db_loop() -> asyncio.AbstractEventLoop:
+    """One event loop in a background thread for the async engine, shared by all sessions."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+def search_companies(query: str, filters: CompanyFilters, limit: int, offset: int) -> pd.DataFrame:
+    async def search() -> list:
+        async with async_session_maker() as session:
+            return await CompanyDAO(session).search(query, filters, limit, offset)
+
+    companies = asyncio.run_coroutine_threadsafe(search(), db_loop()).result()
+    columns = COLUMNS.split(", ")
+    return pd.DataFrame([[getattr(company, column) for column in columns] for company in companies], columns=columns)
+
 
 st.title("Companies")
+query = st.text_input("Search", placeholder="e.g. fintech payments, or a company name (typos are fine)")
+
+with st.sidebar:
+    location = st.text_input("Location contains")
+    dates = st.date_input("Created between", value=())
+    source = st.selectbox("Source", ("All", *SOURCES))
+    sort_label = st.selectbox("Sort by", tuple(SORT_COLUMNS))
+    descending = st.toggle("Descending", value=True)
+    page_size = st.selectbox("Rows per page", PAGE_SIZES)
+
+created_from = datetime.datetime.combine(dates[0], datetime.time(), datetime.UTC) if len(dates) > 0 else None
+created_to = datetime.datetime.combine(dates[1] + datetime.timedelta(days=1), datetime.time(), datetime.UTC) if len(dates) > 1 else None
+conditions, params = build_filters(location, created_from, created_to, source)
+sort_column = SORT_COLUMNS[sort_label]
+
+if query.strip():
+    # Search results are ranked by relevance; the sort options apply to browsing only
+    filters = CompanyFilters(location or None, SOURCES.get(source), created_from, created_to)
+    page = st.number_input("Page", min_value=1, value=1)
+    results = search_companies(query, filters, page_size, (page - 1) * page_size)
+    st.caption(f"{len(results)} matches on page {page}")
+    st.dataframe(results, hide_index=True)
+    st.stop()
+
+filter_key = (tuple(conditions), tuple(params))
+if st.session_state.get("filter_key") != filter_key:
+    st.session_state.filter_key = filter_key
+    st.session_state.total = count_rows(conditions, params)
+    st.session_state.view = None
+
+pages = max(1, -(-st.session_state.total // page_size))
+page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
 
-@st.cache_data
-def load_data():
-    with dbapi.connect(f'{settings.get_db_uri()}') as conn:
-        data = pd.read_sql('SELECT name, location, description, link, created_at  FROM companies', conn)
+view_key = (filter_key, sort_column, descending, page, page_size)
+view = st.session_state.view
+if view is None or view["key"] != view_key:
+    # Taken before the page query so rows written in between are picked up by the next reload
+    watermark = load_watermark()
+    seen = row_versions(load_changes(conditions, params, watermark))
+    view = {"key": view_key, "frame": load_page(conditions, params, sort_column, descending, page, page_size),
+            "watermark": watermark, "seen": seen}
+    st.session_state.view = view
 
-    return data
+if st.button("Reload data"):
+    # Every row in the overlap window comes back on each reload; the next one only needs to skip these
+    recent = load_changes(conditions, params, view["watermark"])
+    changes = drop_seen(recent, view["seen"])
+    view["seen"] = row_versions(recent)
+    if not changes.empty:
+        st.session_state.total = count_rows(conditions, params)
+        view["watermark"] = advance_watermark(view["watermark"], changes)
+        if page == 1:
+            view["frame"] = merge_changes(view["frame"], changes, sort_column, descending, page_size)
+        else:
+            # Rows sorted into earlier pages shift this page's offset, so it is read again
+            view["frame"] = load_page(conditions, params, sort_column, descending, page, page_size)
+    st.caption(f"{len(changes)} new or updated companies")
 
-data_load_state = st.text('Loading data...')
-data = load_data()
-data_load_state.text("Done! (using st.cache_data)")
+st.caption(f"{st.session_state.total} companies match the filters")
+st.dataframe(view["frame"], hide_index=True)
 
-st.write(data)
-if st.button('Reload data'):
-    load_data.clear()
+# Charts read the rollup, so they cost one row per bucket whatever the size of the table
+stats_conditions, stats_params = build_stats_filters(location, created_from, created_to, source)
+with st.expander("New companies per day and location"):
+    daily_counts = load_daily_counts(stats_conditions, stats_params)
+    if daily_counts.empty:
+        st.caption("No companies match the filters")
+    else:
+        st.bar_chart(daily_counts)
+        st.bar_chart(load_top_locations(stats_conditions, stats_params), horizontal=True)
+        st.caption("Counted by UTC creation day and the source that first listed each company")
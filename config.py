@@ -1,6 +1,30 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class CrawlTarget(BaseModel):
+    """A YC batch (query="Spring 2025") or a LinkedIn company search (query="YC S25").
+
+    The target is re-crawled every `interval` seconds while it keeps changing; while it stays
+    unchanged the delay backs off towards `max_interval`. With `stop_at_known_page`, a cycle ends
+    at the first page (LinkedIn) or scroll step (YC) that brings no new companies. With `max_pages`,
+    it ends after that many pages or scroll steps.
+    """
+
+    source: Literal["ycombinator", "linkedin"]
+    query: str
+    interval: float = 30.0
+    max_interval: float = 600.0
+    stop_at_known_page: bool = False
+    max_pages: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.query}"
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file='.env'
@@ -11,6 +35,51 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str
+    # Connections kept open per process, and extra ones opened under load and closed when returned
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    # Seconds before a connection is replaced; -1 keeps connections forever
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    KNOWN_COMPANIES_CACHE_SIZE: int = 100_000
+    ENTITY_MATCH_THRESHOLD: float = 0.7
+    HTML_PARSER: str = "auto"
+    PARSE_WORKERS: int = 0
+    LOOP_LAG_REPORT_SECONDS: float = 60.0
+
+    WRITER_BATCH_SIZE: int = 500
+    WRITER_FLUSH_MS: int = 500
+    WRITER_QUEUE_SIZE: int = 5000
+
+    CRAWL_TARGETS: list[CrawlTarget] = [
+        CrawlTarget(source="ycombinator", query="Spring 2025"),
+        CrawlTarget(source="linkedin", query="YC S25"),
+    ]
+    CRAWL_CONCURRENCY: int = 4
+    CRAWL_RATE_PER_HOST: float = 1.0
+    CRAWL_BURST_PER_HOST: int = 3
+    JOB_LEASE_SECONDS: float = 120.0
+    JOB_MAX_ATTEMPTS: int = 10
+
+    ENRICH_INTERVAL: float = 300.0
+    ENRICH_CONCURRENCY: int = 8
+    ENRICH_RATE_PER_HOST: float = 5.0
+    ENRICH_BATCH_SIZE: int = 200
+    ENRICH_TIMEOUT: float = 30.0
+    HTTP_CACHE_DIR: str = "http_cache"
+
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 9108
+    PROFILE_DIR: str = "profiles"
+    PROFILE_EVERY_N_CYCLES: int = 0
+    PROFILE_TOGGLE_FILE: str = "profile-next-cycle"
+
+    BROWSER_BLOCKED_RESOURCE_TYPES: list[str] = ["image", "font", "media"]
+    BROWSER_MAX_NAVIGATIONS: int = 100
+    BROWSER_MAX_RSS_MB: int = 1500
 
     def get_db_url(self) -> str:
         return (f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@"
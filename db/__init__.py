@@ -3,11 +3,8 @@ from pathlib import Path
 
 
 def load_all_models() -> None:
-    """Load all models from this folder."""
+    """Load the model modules of this folder (models.py, models_*.py), so their tables are in the metadata."""
     package_dir = Path(__file__).resolve().parent
-    modules = pkgutil.walk_packages(
-        path=[str(package_dir)],
-        prefix="db.",
-    )
-    for module in modules:
-        __import__(module.name)
+    for module in pkgutil.iter_modules([str(package_dir)]):
+        if not module.ispkg and module.name.startswith("models"):
+            __import__(f"db.{module.name}")
@@ -1,12 +1,17 @@
 import logging
-from typing import Optional, Union
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional, Union
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import and_, bindparam, delete, exists, func, literal_column, or_, select, String, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from db.models import Company
+from db.models import Company, CompanyDetails, CompanyHistory, CompanySource, SEARCH_CONFIG
+
+# Columns of a company row passed to `upsert_many`
+COMPANY_FIELDS = ("name", "location", "description", "link", "normalized_name", "source", "content_hash")
 
 
 class DAOIntegrityError(Exception):
@@ -24,6 +29,17 @@ class DAOIntegrityError(Exception):
         super().__init__(msg)
 
 
+class CompanyFilters(NamedTuple):
+    location: Optional[str] = None
+    source: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class CompanyDAO:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -40,6 +56,127 @@ class CompanyDAO:
 
         return company
 
+    async def upsert_many(self, companies: Iterable[dict], sources: Iterable[dict] = ()) -> tuple[list[Company], list[Company]]:
+        """Insert new companies and rewrite changed ones, then do the same for their source rows.
+
+        A stored company is rewritten only when the incoming row comes from the company's own
+        source and its `content_hash` differs; the previous version goes to company_history.
+        Each source dict names its company with `company_name`. Everything runs in one
+        transaction. Return the (inserted, updated) companies.
+        """
+        # ON CONFLICT can touch a row once per statement, so the same name from several sources
+        # (only one of which owns the row) is split over passes; normally there is one
+        passes: list[dict[str, dict]] = []
+        for company in companies:
+            for rows_by_name in passes:
+                existing = rows_by_name.get(company["name"])
+                if existing is None or existing["source"] == company["source"]:
+                    rows_by_name[company["name"]] = company
+                    break
+            else:
+                passes.append({company["name"]: company})
+        source_rows = list({(row["source"], row["name"]): row for row in sources}.values())
+        if not passes and not source_rows:
+            return [], []
+
+        try:
+            inserted, updated = [], []
+            for rows_by_name in passes:
+                result = await self.session.execute(self._upsert_companies_stmt(list(rows_by_name.values())))
+                for company, was_inserted in result.tuples():
+                    (inserted if was_inserted else updated).append(company)
+            if source_rows:
+                await self._upsert_sources(source_rows)
+            await self.session.commit()
+        except IntegrityError as e:
+            logging.warning(f"IntegrityError while upserting {sum(map(len, passes))} companies: {e}")
+            await self.session.rollback()
+            raise DAOIntegrityError("Company", None, e) from e
+
+        return inserted, updated
+
+    @staticmethod
+    def _upsert_companies_stmt(rows: list[dict]):
+        """One statement for a whole page: unnest the incoming columns, archive the rows about to
+        change, and insert or update (only rows whose hash differs) in a single pass."""
+        arrays = (bindparam(field, [row[field] for row in rows], type_=ARRAY(String)) for field in COMPANY_FIELDS)
+        columns = (
+            func.unnest(*arrays)
+            .table_valued(*COMPANY_FIELDS)
+            .render_derived()
+        )
+        incoming = select(columns).cte("incoming")
+        changed = (
+            select(
+                Company.id,
+                Company.location,
+                Company.description,
+                Company.link,
+                Company.content_hash,
+                func.coalesce(Company.updated_at, Company.created_at).label("valid_from"),
+            )
+            .join(incoming, incoming.c.name == Company.name)
+            .where(Company.source == incoming.c.source, Company.content_hash != incoming.c.content_hash)
+            # Reads the statement's snapshot, i.e. the versions from before the update below.
+            # FOR UPDATE would skip them: the unreferenced history CTE runs after the main insert
+            .cte("changed")
+        )
+        history = (
+            insert(CompanyHistory)
+            .from_select(
+                ["company_id", "location", "description", "link", "content_hash", "valid_from", "valid_to"],
+                select(changed, func.now()),
+            )
+            .cte("history")
+        )
+
+        stmt = insert(Company).from_select(
+            ["id", *COMPANY_FIELDS, "created_at"],
+            select(func.gen_random_uuid(), *(incoming.c[field] for field in COMPANY_FIELDS), func.now()),
+        )
+        return (
+            stmt.on_conflict_do_update(
+                index_elements=[Company.name],
+                set_={
+                    "location": stmt.excluded.location,
+                    "description": stmt.excluded.description,
+                    "link": stmt.excluded.link,
+                    "content_hash": stmt.excluded.content_hash,
+                    "updated_at": func.now(),
+                },
+                where=and_(Company.source == stmt.excluded.source, Company.content_hash != stmt.excluded.content_hash),
+            )
+            # xmax is 0 only for rows this statement inserted
+            .returning(Company, literal_column("xmax = 0").label("inserted"))
+            .add_cte(history)
+        )
+
+    async def _upsert_sources(self, source_rows: list[dict]) -> None:
+        names = {row["company_name"] for row in source_rows}
+        result = await self.session.execute(select(Company.name, Company.id).where(Company.name.in_(names)))
+        company_ids = dict(result.tuples().all())
+
+        rows = []
+        for row in source_rows:
+            row = dict(row)
+            company_id = company_ids.get(row.pop("company_name"))
+            if company_id is not None:
+                rows.append(row | {"company_id": company_id})
+        if rows:
+            stmt = insert(CompanySource)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CompanySource.source, CompanySource.name],
+                set_={
+                    "location": stmt.excluded.location,
+                    "description": stmt.excluded.description,
+                    "link": stmt.excluded.link,
+                    "content_hash": stmt.excluded.content_hash,
+                    "updated_at": func.now(),
+                },
+                where=CompanySource.content_hash != stmt.excluded.content_hash,
+            )
+            await self.session.execute(stmt, rows)
+
     async def get_by_name(self, company_name: str) -> Optional[Company]:
         stmt = select(Company).where(Company.name == company_name)
 
@@ -47,3 +184,122 @@ class CompanyDAO:
         data = result.scalar()
 
         return data
+
+    async def get_recent_source_hashes(self, limit: int) -> list[tuple[str, str, str]]:
+        """Return up to `limit` (source, name, content hash) triples of source rows, newest first."""
+        stmt = (
+            select(CompanySource.source, CompanySource.name, CompanySource.content_hash)
+            .order_by(func.coalesce(CompanySource.updated_at, CompanySource.created_at).desc())
+            .limit(limit)
+        )
+
+        result = await self.session.execute(stmt)
+        return list(result.tuples().all())
+
+    async def get_source_names(self) -> list[tuple[str, str, str, str]]:
+        """Return (company name, source name, source link, source) for every source row, oldest company first."""
+        stmt = (
+            select(Company.name, CompanySource.name, CompanySource.link, CompanySource.source)
+            .join(CompanySource, CompanySource.company_id == Company.id)
+            .order_by(Company.created_at, Company.id, CompanySource.created_at)
+        )
+
+        result = await self.session.execute(stmt)
+        return list(result.tuples().all())
+
+    async def get_resolution_rows(self) -> list[tuple[UUID, str, str, Optional[str], list[str]]]:
+        """Return (id, name, link, normalized name, sources) for every company, oldest first."""
+        stmt = (
+            select(
+                Company.id,
+                Company.name,
+                Company.link,
+                Company.normalized_name,
+                func.array_remove(func.array_agg(func.distinct(CompanySource.source)), None),
+            )
+            .outerjoin(CompanySource, CompanySource.company_id == Company.id)
+            .group_by(Company.id)
+            .order_by(Company.created_at, Company.id)
+        )
+
+        result = await self.session.execute(stmt)
+        return list(result.tuples().all())
+
+    async def merge_companies(self, clusters: list[list[UUID]], normalized_names: dict[UUID, str]) -> None:
+        """Store normalized names, then fold each cluster into its first company and delete the rest.
+
+        Source rows and history of the removed companies are moved to the kept one. So are their
+        details, unless the kept company has its own.
+        """
+        moves = [{"duplicate_id": duplicate, "kept_id": cluster[0]} for cluster in clusters for duplicate in cluster[1:]]
+
+        try:
+            if normalized_names:
+                await self.session.execute(
+                    update(Company),
+                    [{"id": company_id, "normalized_name": name} for company_id, name in normalized_names.items()],
+                )
+            if moves:
+                for table in (CompanySource.__table__, CompanyHistory.__table__):
+                    await self.session.execute(
+                        update(table)
+                        .where(table.c.company_id == bindparam("duplicate_id"))
+                        .values(company_id=bindparam("kept_id")),
+                        moves,
+                    )
+                # One row per company: the first duplicate's details fill in only where the kept company has none
+                details = CompanyDetails.__table__
+                kept_details = details.alias("kept_details")
+                await self.session.execute(
+                    update(details)
+                    .where(
+                        details.c.company_id == bindparam("duplicate_id"),
+                        ~exists().where(kept_details.c.company_id == bindparam("kept_id")),
+                    )
+                    .values(company_id=bindparam("kept_id")),
+                    moves,
+                )
+                await self.session.execute(
+                    delete(Company).where(Company.id.in_([move["duplicate_id"] for move in moves]))
+                )
+            await self.session.commit()
+        except IntegrityError as e:
+            logging.warning(f"IntegrityError while merging {len(moves)} companies: {e}")
+            await self.session.rollback()
+            raise DAOIntegrityError("Company", None, e) from e
+
+    async def search(
+        self,
+        query: str,
+        filters: Optional[CompanyFilters] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> list[Company]:
+        """Find companies by full-text match on name and description, or a fuzzy match on name.
+
+        Results are ranked by text relevance plus name similarity. An empty query returns the
+        filtered companies, newest first. `location` matches as a case-insensitive substring.
+        """
+        stmt = select(Company)
+        query = query.strip()
+        if query:
+            tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+            rank = func.ts_rank_cd(Company.search_vector, tsquery) + func.word_similarity(query, Company.name)
+            # `name %> query` is served by the trigram index: word_similarity above pg_trgm's threshold
+            stmt = stmt.where(or_(Company.search_vector.op("@@")(tsquery), Company.name.op("%>")(query)))
+            stmt = stmt.order_by(rank.desc(), Company.name)
+        else:
+            stmt = stmt.order_by(Company.created_at.desc())
+
+        filters = filters or CompanyFilters()
+        if filters.location:
+            stmt = stmt.where(Company.location.ilike(f"%{_escape_like(filters.location)}%"))
+        if filters.source:
+            stmt = stmt.where(Company.sources.any(CompanySource.source == filters.source))
+        if filters.created_from is not None:
+            stmt = stmt.where(Company.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            stmt = stmt.where(Company.created_at < filters.created_to)
+
+        result = await self.session.scalars(stmt.limit(limit).offset(offset))
+        return list(result.all())
@@ -0,0 +1,62 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Company, CompanyDetails, CompanySource
+
+# Columns of a details row passed to `upsert_many`
+DETAIL_FIELDS = ("company_id", "website", "team_size", "year_founded", "founders", "tags")
+
+
+class CompanyDetailsDAO:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_pending(self, limit: int) -> list[tuple[UUID, str]]:
+        """Return (company id, YC link) of companies with a YC card and no details yet, newest first."""
+        stmt = (
+            select(CompanySource.company_id, CompanySource.link)
+            .join(Company, Company.id == CompanySource.company_id)
+            .where(
+                CompanySource.source == "ycombinator",
+                CompanySource.link != "N/A",
+                ~exists().where(CompanyDetails.company_id == CompanySource.company_id),
+            )
+            .order_by(Company.created_at.desc())
+            .limit(limit)
+        )
+
+        result = await self.session.execute(stmt)
+        return list(result.tuples().all())
+
+    async def get_enriched(self, after: Optional[UUID], limit: int) -> list[tuple[UUID, str]]:
+        """Return (company id, YC link) of enriched companies, `limit` at a time in company id order."""
+        stmt = (
+            select(CompanySource.company_id, CompanySource.link)
+            .join(CompanyDetails, CompanyDetails.company_id == CompanySource.company_id)
+            .where(CompanySource.source == "ycombinator", CompanySource.link != "N/A")
+            .order_by(CompanySource.company_id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(CompanySource.company_id > after)
+
+        result = await self.session.execute(stmt)
+        return list(result.tuples().all())
+
+    async def upsert_many(self, rows: list[dict]) -> None:
+        """Insert or overwrite the details of every company in `rows` in one statement."""
+        if not rows:
+            return
+
+        stmt = insert(CompanyDetails).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CompanyDetails.company_id],
+            set_={field: stmt.excluded[field] for field in DETAIL_FIELDS if field != "company_id"} | {"fetched_at": func.now()},
+        )
+
+        await self.session.execute(stmt)
+        await self.session.commit()
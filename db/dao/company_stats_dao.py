@@ -0,0 +1,29 @@
+from sqlalchemy import Date, cast, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Company, CompanyDailyStats
+
+
+class CompanyStatsDAO:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def rebuild(self) -> int:
+        """Recompute company_daily_stats from the companies table. Return the number of buckets.
+
+        Writes to companies wait until the rebuild commits, so no change is counted twice or lost.
+        """
+        day = cast(func.timezone("UTC", Company.created_at), Date)
+        buckets = (
+            select(day, Company.source, Company.location, func.count())
+            .group_by(day, Company.source, Company.location)
+        )
+
+        await self.session.execute(text("LOCK TABLE companies IN SHARE MODE"))
+        await self.session.execute(delete(CompanyDailyStats))
+        result = await self.session.execute(
+            insert(CompanyDailyStats).from_select(["day", "source", "location", "companies"], buckets)
+        )
+        await self.session.commit()
+        return result.rowcount
@@ -0,0 +1,29 @@
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import CrawlCheckpoint
+
+
+class CrawlCheckpointDAO:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get(self, target_key: str) -> Optional[CrawlCheckpoint]:
+        stmt = select(CrawlCheckpoint).where(CrawlCheckpoint.target_key == target_key)
+
+        result = await self.session.execute(stmt)
+        return result.scalar()
+
+    async def save(self, checkpoint: dict) -> None:
+        """Insert or overwrite the checkpoint of `checkpoint['target_key']`."""
+        stmt = insert(CrawlCheckpoint).values(**checkpoint)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CrawlCheckpoint.target_key],
+            set_={key: stmt.excluded[key] for key in checkpoint if key != "target_key"} | {"updated_at": func.now()},
+        )
+
+        await self.session.execute(stmt)
+        await self.session.commit()
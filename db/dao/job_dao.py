@@ -0,0 +1,138 @@
+from datetime import timedelta
+from typing import Iterable
+
+from sqlalchemy import case, cast, delete, exists, func, literal, or_, select, String, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import CompanyDetails, CompanySource, Job
+
+
+class JobDAO:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def claim(self, worker_id: str, kinds: Iterable[str], limit: int, lease_seconds: float) -> list[Job]:
+        """Lease up to `limit` due jobs to `worker_id`, oldest due first.
+
+        SKIP LOCKED lets concurrent workers claim different jobs without waiting on each other.
+        """
+        due = (
+            select(Job.id)
+            .where(
+                Job.kind.in_(list(kinds)),
+                Job.run_at <= func.now(),
+                Job.parked_at.is_(None),
+                or_(Job.locked_until.is_(None), Job.locked_until < func.now()),
+            )
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Job)
+            .where(Job.id.in_(due))
+            .values(locked_by=worker_id, locked_until=func.now() + timedelta(seconds=lease_seconds), attempts=Job.attempts + 1)
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.session.execute(stmt)
+        jobs = list(result.scalars().all())
+        await self.session.commit()
+        return jobs
+
+    async def heartbeat(self, worker_id: str, job_ids: list[int], lease_seconds: float) -> set[int]:
+        """Extend the leases `worker_id` holds on `job_ids`. Return the ids it still holds."""
+        stmt = (
+            update(Job)
+            .where(Job.id.in_(job_ids), Job.locked_by == worker_id)
+            .values(locked_until=func.now() + timedelta(seconds=lease_seconds))
+            .returning(Job.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.session.execute(stmt)
+        held = set(result.scalars().all())
+        await self.session.commit()
+        return held
+
+    async def release(self, job_id: int, worker_id: str, delay: float, payload: dict, **values) -> bool:
+        """Give up the lease and make the job due again in `delay` seconds. False if the lease was lost."""
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id)
+            .values(
+                locked_by=None,
+                locked_until=None,
+                run_at=func.now() + timedelta(seconds=delay),
+                payload=payload,
+                **values
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def delete(self, job_id: int, worker_id: str) -> bool:
+        """Delete a finished job. False if the lease was lost."""
+        result = await self.session.execute(delete(Job).where(Job.id == job_id, Job.locked_by == worker_id))
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def schedule(self, kind: str, jobs: dict[str, dict]) -> None:
+        """Make sure a recurring job exists for every key in `jobs` and drop `kind` jobs that are not listed.
+
+        New jobs are due at once. Existing jobs keep their schedule; their payload is updated
+        with the given one. Parked jobs are unparked and due at once, so restarting the workers
+        retries them.
+        """
+        if jobs:
+            stmt = insert(Job).values([
+                {"kind": kind, "key": key, "payload": payload, "run_at": func.now(), "attempts": 0}
+                for key, payload in jobs.items()
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.key],
+                set_={
+                    "payload": Job.payload.concat(stmt.excluded.payload),
+                    "run_at": case((Job.parked_at.is_not(None), func.now()), else_=Job.run_at),
+                    "attempts": case((Job.parked_at.is_not(None), 0), else_=Job.attempts),
+                    "parked_at": None,
+                },
+            )
+            await self.session.execute(stmt)
+        await self.session.execute(delete(Job).where(Job.kind == kind, Job.key.not_in(list(jobs))))
+        await self.session.commit()
+
+    async def enqueue_pending_enrichment(self, kind: str) -> int:
+        """Queue one `kind` job per company with a YC card, no details and no job yet. Return how many were queued."""
+        key = literal(f"{kind}:") + cast(CompanySource.company_id, String)
+        pending = (
+            select(
+                literal(kind),
+                key,
+                func.jsonb_build_object("company_id", cast(CompanySource.company_id, String), "link", CompanySource.link),
+                func.now(),
+                literal(0),
+                func.now(),
+            )
+            .where(
+                CompanySource.source == "ycombinator",
+                CompanySource.link != "N/A",
+                ~exists().where(CompanyDetails.company_id == CompanySource.company_id),
+                ~exists().where(Job.key == key),
+            )
+        )
+        # A company merged from two YC cards yields its key twice; the second row is skipped
+        stmt = (
+            insert(Job)
+            .from_select(["kind", "key", "payload", "run_at", "attempts", "created_at"], pending)
+            .on_conflict_do_nothing(index_elements=[Job.key])
+        )
+
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount
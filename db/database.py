@@ -4,7 +4,24 @@ from config import settings
 
 DATABASE_URL = settings.get_db_url()
 
-engine = create_async_engine(DATABASE_URL)
+
+def engine_options() -> dict:
+    """Pool and driver options for create_async_engine, from settings."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        # SQLAlchemy's prepared statement cache and asyncpg's own; 0 turns both off, as pgbouncer in transaction mode needs
+        "connect_args": {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    }
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options())
 async_session_maker = async_sessionmaker(
     engine,
     expire_on_commit=False,
@@ -0,0 +1,29 @@
+"""index company timestamps
+
+Revision ID: 3b9d2f7c41a0
+Revises: e67a0288e62e
+Create Date: 2026-10-17 18:20:11.402617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2f7c41a0'
+down_revision: Union[str, Sequence[str], None] = 'e67a0288e62e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_companies_created_at'), 'companies', ['created_at'], unique=False)
+    op.create_index(op.f('ix_companies_updated_at'), 'companies', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_companies_updated_at'), table_name='companies')
+    op.drop_index(op.f('ix_companies_created_at'), table_name='companies')
@@ -0,0 +1,48 @@
+"""company search indexes
+
+Revision ID: 8c51e0d4a7f3
+Revises: 3b9d2f7c41a0
+Create Date: 2026-10-17 18:41:52.118043
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c51e0d4a7f3'
+down_revision: Union[str, Sequence[str], None] = '3b9d2f7c41a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('companies', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', name), 'A') || "
+            "setweight(to_tsvector('english', description), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_companies_search_vector', 'companies', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_companies_name_trgm', 'companies', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_companies_location_trgm', 'companies', ['location'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_companies_location_trgm', table_name='companies', postgresql_using='gin')
+    op.drop_index('ix_companies_name_trgm', table_name='companies', postgresql_using='gin')
+    op.drop_index('ix_companies_search_vector', table_name='companies', postgresql_using='gin')
+    op.drop_column('companies', 'search_vector')
+    # pg_trgm is left installed; other objects in the database may use it
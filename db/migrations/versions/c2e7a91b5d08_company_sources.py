@@ -0,0 +1,56 @@
+"""company sources
+
+Revision ID: c2e7a91b5d08
+Revises: 8c51e0d4a7f3
+Create Date: 2026-10-17 19:26:37.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7a91b5d08'
+down_revision: Union[str, Sequence[str], None] = '8c51e0d4a7f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('companies', sa.Column('normalized_name', sa.String(), nullable=True))
+    op.create_index(op.f('ix_companies_normalized_name'), 'companies', ['normalized_name'], unique=False)
+    op.create_table('company_sources',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('company_id', sa.UUID(), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('location', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('link', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'name')
+    )
+    op.create_index(op.f('ix_company_sources_company_id'), 'company_sources', ['company_id'], unique=False)
+
+    # Existing companies came from exactly one scraper, recognisable by their link
+    op.execute("""
+        INSERT INTO company_sources (id, company_id, source, name, location, description, link, created_at, updated_at)
+        SELECT gen_random_uuid(), id,
+               CASE WHEN link LIKE '%linkedin.com/%' THEN 'linkedin' ELSE 'ycombinator' END,
+               name, location, description, link, created_at, updated_at
+        FROM companies
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_company_sources_company_id'), table_name='company_sources')
+    op.drop_table('company_sources')
+    op.drop_index(op.f('ix_companies_normalized_name'), table_name='companies')
+    op.drop_column('companies', 'normalized_name')
@@ -0,0 +1,62 @@
+"""company content hash and history
+
+Revision ID: f4a0c3d9e6b2
+Revises: c2e7a91b5d08
+Create Date: 2026-10-17 20:12:05.981774
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a0c3d9e6b2'
+down_revision: Union[str, Sequence[str], None] = 'c2e7a91b5d08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match services.records.content_hash
+CONTENT_HASH_SQL = "md5(location || E'\\x1f' || description || E'\\x1f' || link)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('companies', sa.Column('source', sa.String(), nullable=True))
+    op.add_column('companies', sa.Column('content_hash', sa.String(length=32), nullable=True))
+    op.add_column('company_sources', sa.Column('content_hash', sa.String(length=32), nullable=True))
+    op.execute("""
+        UPDATE companies c SET source = COALESCE(
+            (SELECT s.source FROM company_sources s WHERE s.company_id = c.id AND s.name = c.name ORDER BY s.created_at LIMIT 1),
+            CASE WHEN c.link LIKE '%linkedin.com/%' THEN 'linkedin' ELSE 'ycombinator' END
+        )
+    """)
+    op.execute(f"UPDATE companies SET content_hash = {CONTENT_HASH_SQL}")
+    op.execute(f"UPDATE company_sources SET content_hash = {CONTENT_HASH_SQL}")
+    op.alter_column('companies', 'source', nullable=False)
+    op.alter_column('companies', 'content_hash', nullable=False)
+    op.alter_column('company_sources', 'content_hash', nullable=False)
+
+    op.create_table('company_history',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('company_id', sa.UUID(), nullable=False),
+    sa.Column('location', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('link', sa.String(), nullable=False),
+    sa.Column('content_hash', sa.String(length=32), nullable=False),
+    sa.Column('valid_from', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('valid_to', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_company_history_company_id'), 'company_history', ['company_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_company_history_company_id'), table_name='company_history')
+    op.drop_table('company_history')
+    op.drop_column('company_sources', 'content_hash')
+    op.drop_column('companies', 'content_hash')
+    op.drop_column('companies', 'source')
@@ -1,21 +1,153 @@
 from uuid import UUID as BASE_UUID, uuid4
 
 from db.base import Base
-from datetime import datetime, UTC
+from datetime import date, datetime, UTC
 
-from sqlalchemy import DateTime, String
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, Boolean, Computed, Date, DateTime, ForeignKey, Identity, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+
+# Text search configuration shared by the generated column and the queries that use it
+SEARCH_CONFIG = "english"
 
 
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index("ix_companies_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_companies_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_companies_location_trgm", "location", postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"}),
+    )
 
     id: Mapped[BASE_UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     location: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=False)
     link: Mapped[str] = mapped_column(String, nullable=False)
+    # Output of services.entity_resolution.normalize_name, used to match spellings across sources
+    normalized_name: Mapped[str] = mapped_column(String, nullable=True, index=True)
+    # The source whose card this row mirrors; only that source's changes are written here
+    source: Mapped[str] = mapped_column(String, nullable=False)
+    # services.records.content_hash of location, description and link
+    content_hash: Mapped[str] = mapped_column(String(32), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), index=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), onupdate=lambda: datetime.now(UTC), nullable=True, index=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', name), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', description), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    sources: Mapped[list["CompanySource"]] = relationship(back_populates="company", lazy="raise")
+
+
+class CompanySource(Base):
+    """One source's view of a company: the card as it was scraped from that site."""
+
+    __tablename__ = "company_sources"
+    __table_args__ = (UniqueConstraint("source", "name"),)
+
+    id: Mapped[BASE_UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
+    company_id: Mapped[BASE_UUID] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
+    source: Mapped[str] = mapped_column(String, nullable=False)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    location: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[str] = mapped_column(String, nullable=False)
+    link: Mapped[str] = mapped_column(String, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(32), nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), onupdate=lambda: datetime.now(UTC), nullable=True)
+
+    company: Mapped[Company] = relationship(back_populates="sources", lazy="raise")
+
+
+class CompanyHistory(Base):
+    """A previous version of a company's changeable fields, valid until it was overwritten."""
+
+    __tablename__ = "company_history"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    company_id: Mapped[BASE_UUID] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
+    location: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[str] = mapped_column(String, nullable=False)
+    link: Mapped[str] = mapped_column(String, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(32), nullable=False)
+    valid_from: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    valid_to: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class CrawlCheckpoint(Base):
+    """Progress of the current crawl cycle of one target, saved after every completed page."""
+
+    __tablename__ = "crawl_checkpoints"
+
+    target_key: Mapped[str] = mapped_column(String, primary_key=True)
+    cycle_id: Mapped[BASE_UUID] = mapped_column(UUID, nullable=False)
+    # LinkedIn: last completed result page; Y Combinator: last completed scroll step
+    page_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Cards loaded when the page was completed (Y Combinator scroll depth)
+    card_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Link of the last card on the completed page; a resumed Y Combinator cycle checks the list still ends there
+    last_card: Mapped[str] = mapped_column(String, nullable=True)
+    completed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
+
+
+class CompanyDetails(Base):
+    """Fields parsed from a company's YC detail page. All empty if the page is gone or has no company data."""
+
+    __tablename__ = "company_details"
+
+    company_id: Mapped[BASE_UUID] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    website: Mapped[str] = mapped_column(String, nullable=True)
+    team_size: Mapped[int] = mapped_column(Integer, nullable=True)
+    year_founded: Mapped[int] = mapped_column(Integer, nullable=True)
+    founders: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    tags: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
+
+
+class Job(Base):
+    """A unit of work for worker processes: a crawl target, the enrichment scan or one company to enrich.
+
+    A worker claims a due job by taking its lease (`locked_by`, `locked_until`) and extends the lease
+    while the job runs. Once a lease runs out the job is due again, so a crashed worker's jobs are
+    picked up by the others. A job that keeps failing is parked (`parked_at`) and no longer claimed.
+    """
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    key: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    # Claims since the last success; drives the retry backoff
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    locked_by: Mapped[str] = mapped_column(String, nullable=True)
+    locked_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str] = mapped_column(String, nullable=True)
+    parked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+
+class CompanyDailyStats(Base):
+    """Companies per UTC creation day, creating source and current location.
+
+    Kept up to date by statement-level triggers on `companies`, so every insert, location change and
+    delete adjusts its buckets in the same transaction. `main.py rebuild-stats` recomputes it from scratch.
+    """
+
+    __tablename__ = "company_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    source: Mapped[str] = mapped_column(String, primary_key=True)
+    location: Mapped[str] = mapped_column(String, primary_key=True)
+    companies: Mapped[int] = mapped_column(Integer, nullable=False)
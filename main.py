@@ -1,30 +1,356 @@
+"""Command line entry point.
+
+Every command imports what it needs when it runs, so `--help`, exports and other short commands
+do not pay for Playwright, the parsers or the ORM at start-up.
+"""
+import argparse
 import asyncio
+import datetime
 import logging
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Literal, Optional
 
-from db.database import async_session_maker
-from services.company_service import CompanyService
-from services.stream_scraper_service import StreamScraperService
-from script import load_and_convert_cookies, JSON_COOKIE_PATH
+if TYPE_CHECKING:
+    from config import CrawlTarget
+    from services.company_enricher import CompanyEnricher
+    from services.profiling import CycleProfiler
+    from services.stream_scraper_service import StreamScraperService
 
+CRAWL_SOURCES = {"yc": "ycombinator", "linkedin": "linkedin"}
+# services.bulk_transfer.FORMATS, spelled out so that argument parsing does not import pyarrow
+BULK_FORMATS = ("parquet", "arrow")
 
-async def main():
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+@asynccontextmanager
+async def crawl_services(
+    har_dir: Optional[str] = None,
+    har_mode: Optional[Literal["record", "replay"]] = None,
+    init_scripts: tuple[str, ...] = (),
+    metrics: Literal["off", "on", "if_free"] = "off"
+) -> AsyncIterator[tuple["StreamScraperService", "CompanyEnricher", "CycleProfiler"]]:
+    """Start everything a crawl needs and shut it down again on exit.
+
+    With `har_mode`, the browser records to or replays from `har_dir` and checkpoints are not used,
+    so every crawl starts from the first page the recording starts from. Replays are not rate limited.
+    `metrics` serves Prometheus metrics on METRICS_PORT; with "if_free", a port already taken (e.g. by
+    another worker on the same host) is logged instead of failing the start.
+    """
+    from config import settings
+    from db.database import async_session_maker
+    from script import load_and_convert_cookies, JSON_COOKIE_PATH
+    from services.browser_pool import BrowserPool
+    from services.company_service import CompanyService
+    from services.company_writer import CompanyWriter
+    from services.crawl_checkpoints import CheckpointStore
+    from services.entity_resolution import EntityResolver
+    from services.known_company_index import KnownCompanyIndex
+    from services.loop_lag import LoopLagMonitor
+    from services.metrics import start_metrics_server
+    from services.parse_executor import ParseExecutor
+    from services.profiling import CycleProfiler
+    from services.rate_limiter import HostRateLimiter
+    from services.stream_scraper_service import StreamScraperService
 
     ln_cookie = load_and_convert_cookies(JSON_COOKIE_PATH)
-    company_service = CompanyService(async_session_maker)
-    scraper = StreamScraperService(company_service, ln_cookie)
+    known_index = KnownCompanyIndex(settings.KNOWN_COMPANIES_CACHE_SIZE)
+    if metrics != "off" and settings.METRICS_PORT:
+        try:
+            start_metrics_server(settings.METRICS_PORT, settings.METRICS_HOST, known_index)
+            logging.info(f"Metrics on http://{settings.METRICS_HOST}:{settings.METRICS_PORT}/metrics")
+        except OSError as e:
+            if metrics != "if_free":
+                raise
+            logging.warning(f"Metrics not served, port {settings.METRICS_PORT} unavailable: {e}")
+
+    company_service = CompanyService(async_session_maker, known_index, EntityResolver(settings.ENTITY_MATCH_THRESHOLD))
+    await company_service.warm_known_index()
+    await company_service.warm_resolver()
+    parse_executor = ParseExecutor(settings.HTML_PARSER, settings.PARSE_WORKERS)
+    browser_pool = BrowserPool(
+        blocked_resource_types=tuple(settings.BROWSER_BLOCKED_RESOURCE_TYPES),
+        max_navigations=settings.BROWSER_MAX_NAVIGATIONS,
+        max_rss_mb=settings.BROWSER_MAX_RSS_MB,
+        har_dir=har_dir,
+        har_mode=har_mode,
+        init_scripts=init_scripts
+    )
+    writer = CompanyWriter(
+        company_service,
+        batch_size=settings.WRITER_BATCH_SIZE,
+        flush_ms=settings.WRITER_FLUSH_MS,
+        max_queue=settings.WRITER_QUEUE_SIZE
+    )
+    writer.start()
+    scraper = StreamScraperService(
+        company_service,
+        ln_cookie,
+        parse_executor=parse_executor,
+        browser_pool=browser_pool,
+        writer=writer,
+        rate_limiter=None if har_mode == "replay" else HostRateLimiter(settings.CRAWL_RATE_PER_HOST, settings.CRAWL_BURST_PER_HOST),
+        checkpoints=None if har_mode else CheckpointStore(async_session_maker)
+    )
+    enricher = create_enricher()
+    profiler = CycleProfiler(settings.PROFILE_DIR, settings.PROFILE_EVERY_N_CYCLES, settings.PROFILE_TOGGLE_FILE)
+    loop_lag_task = asyncio.create_task(LoopLagMonitor().run(settings.LOOP_LAG_REPORT_SECONDS))
+
+    try:
+        yield scraper, enricher, profiler
+    finally:
+        await writer.close()
+        loop_lag_task.cancel()
+        await enricher.close()
+        parse_executor.shutdown()
+        await browser_pool.close()
+
+
+def select_targets(which: str = "all", max_pages: Optional[int] = None) -> list["CrawlTarget"]:
+    """The configured crawl targets of one source ("yc", "linkedin") or "all", optionally page-limited."""
+    from config import settings
+
+    targets = [target for target in settings.CRAWL_TARGETS if which == "all" or target.source == CRAWL_SOURCES[which]]
+    if max_pages is not None:
+        targets = [target.model_copy(update={"max_pages": max_pages}) for target in targets]
+    return targets
+
+
+async def crawl_targets_once(
+    scraper: "StreamScraperService",
+    targets: list["CrawlTarget"],
+    profiler: Optional["CycleProfiler"] = None
+) -> list:
+    """Crawl every target once, at most CRAWL_CONCURRENCY at a time. Return new companies or the exception, per target."""
+    from config import settings
+    from services.crawl_scheduler import crawl_once
+
+    semaphore = asyncio.Semaphore(settings.CRAWL_CONCURRENCY)
+
+    async def crawl(target: "CrawlTarget") -> int:
+        async with semaphore:
+            return await crawl_once(scraper, target, profiler)
+
+    results = await asyncio.gather(*(crawl(target) for target in targets), return_exceptions=True)
+    for target, result in zip(targets, results):
+        if isinstance(result, Exception):
+            logging.error(f"Crawl of {target.key} failed: {result}")
+    return results
+
 
-    while True:
+async def main(targets: list["CrawlTarget"], once: bool = False) -> int:
+    """Crawl `targets` on their intervals until stopped, or each once with `once`. Return the exit status."""
+    from config import settings
+    from services.crawl_scheduler import CrawlScheduler
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not targets:
+        logging.error("No crawl targets configured for this source")
+        return 1
+
+    # One-off runs stay off the metrics port, which the daemon may be holding
+    async with crawl_services(metrics="off" if once else "on") as (scraper, enricher, profiler):
+        if once:
+            results = await crawl_targets_once(scraper, targets, profiler)
+            failed = sum(isinstance(result, Exception) for result in results)
+            new_companies = sum(result for result in results if not isinstance(result, Exception))
+            logging.info(f"Crawled {len(targets)} targets: {new_companies} new companies, {failed} failed")
+            return 1 if failed else 0
+
+        scheduler = CrawlScheduler(scraper, targets, settings.CRAWL_CONCURRENCY, profiler=profiler)
+        enrich_task = asyncio.create_task(enricher.run(settings.ENRICH_INTERVAL)) if settings.ENRICH_INTERVAL else None
         try:
-            await asyncio.gather(
-                scraper.parse_ycombinator_site(),
-                scraper.parse_linkedin(),
-                return_exceptions=True
-            )
-        except Exception as e:
-            logging.error(f"Error in main loop: {e}")
-            await asyncio.sleep(3)
+            await scheduler.run()
+        except KeyboardInterrupt:
+            logging.info("Scraping stopped by user")
+        finally:
+            if enrich_task is not None:
+                enrich_task.cancel()
+    return 0
+
+
+async def worker(concurrency: Optional[int]):
+    from config import settings
+    from db.database import async_session_maker
+    from services.job_handlers import CRAWL, ENRICH, ENRICH_SCAN, CrawlJobs, EnrichmentJobs, schedule_jobs
+    from services.job_worker import JobWorker
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    async with crawl_services(metrics="if_free") as (scraper, enricher, profiler):
+        await schedule_jobs(async_session_maker, settings.CRAWL_TARGETS, settings.ENRICH_INTERVAL)
+        crawl_jobs = CrawlJobs(scraper, profiler)
+        enrichment_jobs = EnrichmentJobs(enricher, async_session_maker, settings.ENRICH_INTERVAL)
+        job_worker = JobWorker(
+            async_session_maker,
+            {CRAWL: crawl_jobs.run, ENRICH_SCAN: enrichment_jobs.scan, ENRICH: enrichment_jobs.enrich},
+            concurrency=concurrency or settings.CRAWL_CONCURRENCY,
+            lease_seconds=settings.JOB_LEASE_SECONDS,
+            max_attempts=settings.JOB_MAX_ATTEMPTS
+        )
+        await job_worker.run()
+
+
+async def record(har_dir: str):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    targets = select_targets()
+    # The HAR files are written when the browser contexts close, on exit
+    async with crawl_services(har_dir, "record") as (scraper, enricher, profiler):
+        results = await crawl_targets_once(scraper, targets)
+    recorded = [result for result in results if not isinstance(result, Exception)]
+    logging.info(f"Recorded {len(recorded)} of {len(targets)} targets to {har_dir} ({sum(recorded)} new companies saved)")
+
+
+def _cards_parsed() -> float:
+    from prometheus_client import REGISTRY
+
+    return sum(REGISTRY.get_sample_value("scraper_cards_parsed_total", {"source": source}) or 0 for source in ("ycombinator", "linkedin"))
+
+
+async def loadtest(har_dir: str, copies: int, cycles: int):
+    from services.replay import duplicate_cards_script
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    targets = select_targets()
+    init_scripts = (duplicate_cards_script(copies),) if copies else ()
+    async with crawl_services(har_dir, "replay", init_scripts) as (scraper, enricher, profiler):
+        writer = scraper.writer
+        start = time.perf_counter()
+        for cycle in range(1, cycles + 1):
+            cycle_start = time.perf_counter()
+            results = await crawl_targets_once(scraper, targets)
+            new_companies = sum(result for result in results if not isinstance(result, Exception))
+            logging.info(f"Cycle {cycle}: {new_companies} new companies in {time.perf_counter() - cycle_start:.1f}s")
+        # Writes still queued count towards the run
+        await writer.queue.join()
+        elapsed = time.perf_counter() - start
+
+    cards = _cards_parsed()
+    logging.info(
+        f"Load test: {cycles} cycles over {len(targets)} targets in {elapsed:.1f}s, "
+        f"{cards:.0f} cards parsed ({cards / elapsed:.0f}/s), "
+        f"{writer.written} rows written in {writer.batches} batches ({writer.written / elapsed:.0f} rows/s), "
+        f"{writer.created} new companies"
+    )
+
+
+def create_enricher() -> "CompanyEnricher":
+    from config import settings
+    from db.database import async_session_maker
+    from services.company_enricher import CompanyEnricher
+    from services.http_cache import HttpCache
+    from services.rate_limiter import HostRateLimiter
+
+    return CompanyEnricher(
+        async_session_maker,
+        HttpCache(settings.HTTP_CACHE_DIR),
+        concurrency=settings.ENRICH_CONCURRENCY,
+        timeout=settings.ENRICH_TIMEOUT,
+        batch_size=settings.ENRICH_BATCH_SIZE,
+        rate_limiter=HostRateLimiter(settings.ENRICH_RATE_PER_HOST, settings.ENRICH_CONCURRENCY)
+    )
+
+
+async def enrich(refresh: bool):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    enricher = create_enricher()
+    try:
+        enriched = await enricher.refresh_all() if refresh else await enricher.enrich_pending()
+    finally:
+        await enricher.close()
+    logging.info(f"{'Updated' if refresh else 'Enriched'} {enriched} companies")
+
+
+async def resolve(dry_run: bool):
+    from db.database import async_session_maker
+    from services.company_service import CompanyService
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    company_service = CompanyService(async_session_maker)
+    merged = await company_service.resolve_all(dry_run=dry_run)
+    logging.info(f"{'Would merge' if dry_run else 'Merged'} {merged} duplicate companies")
+
+
+async def rebuild_stats():
+    from db.database import async_session_maker
+    from services.company_service import CompanyService
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    buckets = await CompanyService(async_session_maker).rebuild_daily_stats()
+    logging.info(f"Rebuilt company_daily_stats: {buckets} day/source/location buckets")
+
+
+def export(path: str, file_format: str, created_from: datetime.date, created_to: datetime.date):
+    from services.bulk_transfer import export_companies
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # Dates are whole UTC days, both ends included, as in the dashboard filter
+    start = datetime.datetime.combine(created_from, datetime.time(), datetime.UTC) if created_from else None
+    end = datetime.datetime.combine(created_to + datetime.timedelta(days=1), datetime.time(), datetime.UTC) if created_to else None
+    export_companies(path, file_format, start, end)
+
+
+def load(path: str, file_format: str):
+    from services.bulk_transfer import import_companies
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    import_companies(path, file_format)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Y Combinator and LinkedIn company scraper")
+    subcommands = parser.add_subparsers(dest="command")
+    crawl_parser = subcommands.add_parser("crawl", help="crawl the configured targets (default: all, until stopped)")
+    crawl_parser.add_argument("source", nargs="?", choices=("all", *CRAWL_SOURCES), default="all")
+    crawl_parser.add_argument("--once", action="store_true", help="crawl each target once and exit, with status 1 if any failed")
+    crawl_parser.add_argument("--max-pages", type=int, help="stop each cycle after this many LinkedIn pages or YC scroll steps")
+    resolve_parser = subcommands.add_parser("resolve", help="re-run entity resolution over stored companies")
+    resolve_parser.add_argument("--dry-run", action="store_true", help="log the merges without applying them")
+    enrich_parser = subcommands.add_parser("enrich", help="fetch YC company pages of companies without details")
+    enrich_parser.add_argument("--refresh", action="store_true", help="revalidate the pages of all enriched companies instead")
+    subcommands.add_parser("rebuild-stats", help="recompute the daily company statistics from the companies table")
+    worker_parser = subcommands.add_parser("worker", help="run crawl and enrichment jobs from the shared job queue")
+    worker_parser.add_argument("--concurrency", type=int, help="jobs to run at once (default: CRAWL_CONCURRENCY)")
+    record_parser = subcommands.add_parser("record", help="crawl every target once and save the traffic to HAR files")
+    record_parser.add_argument("har_dir")
+    loadtest_parser = subcommands.add_parser("loadtest", help="crawl recorded HAR files offline and report throughput")
+    loadtest_parser.add_argument("har_dir")
+    loadtest_parser.add_argument("--copies", type=int, default=0, help="extra copies of every recorded card")
+    loadtest_parser.add_argument("--cycles", type=int, default=1, help="crawl cycles over all targets")
+    export_parser = subcommands.add_parser("export", help="write companies to a Parquet or Arrow IPC file")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=BULK_FORMATS, help="default: parquet for .parquet files, otherwise arrow")
+    export_parser.add_argument("--created-from", type=datetime.date.fromisoformat, help="YYYY-MM-DD, included")
+    export_parser.add_argument("--created-to", type=datetime.date.fromisoformat, help="YYYY-MM-DD, included")
+    import_parser = subcommands.add_parser("import", help="merge companies from an exported file on name")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=BULK_FORMATS, help="default: parquet for .parquet files, otherwise arrow")
+    args = parser.parse_args()
+
+    if args.command == "resolve":
+        asyncio.run(resolve(args.dry_run))
+    elif args.command == "enrich":
+        asyncio.run(enrich(args.refresh))
+    elif args.command == "rebuild-stats":
+        asyncio.run(rebuild_stats())
+    elif args.command == "export":
+        export(args.path, args.format, args.created_from, args.created_to)
+    elif args.command == "import":
+        load(args.path, args.format)
+    elif args.command == "record":
+        asyncio.run(record(args.har_dir))
+    elif args.command == "loadtest":
+        asyncio.run(loadtest(args.har_dir, args.copies, args.cycles))
+    elif args.command == "worker":
+        asyncio.run(worker(args.concurrency))
+    elif args.command == "crawl":
+        sys.exit(asyncio.run(main(select_targets(args.source, args.max_pages), args.once)))
+    else:
+        sys.exit(asyncio.run(main(select_targets())))
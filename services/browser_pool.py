@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import re
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Literal, Optional
+from urllib.parse import urlsplit
+
+import psutil
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright, Route
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+DEFAULT_BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.io",
+    "hotjar.com",
+    "facebook.net",
+)
+HAR_UNSAFE_CHARS = re.compile(r'[^\w.-]+')
+
+
+def _har_stem(key: str) -> str:
+    """File name prefix for the HAR files of a context key like "ycombinator:Spring 2025"."""
+    return HAR_UNSAFE_CHARS.sub("_", key)
+
+
+class _Slot:
+    """A browser context and its page, handed out to one scraper at a time."""
+
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.navigations = 0
+
+
+class BrowserPool:
+    """One shared Chromium process that hands out isolated, recyclable contexts by key.
+
+    Requests for images, fonts, media and known analytics hosts are aborted. A context is
+    recycled after `max_navigations` main-frame navigations. When the RSS of the Chromium
+    process tree passes `max_rss_mb`, new leases wait until the current ones end, and the whole
+    browser is relaunched; closing contexts alone does not give the browser's memory back.
+
+    With `har_mode="record"`, every context's traffic is saved to a HAR file in `har_dir` when the
+    context closes. With `har_mode="replay"`, contexts are answered from those files and any
+    request they do not cover is aborted, so nothing reaches the live sites. `init_scripts` run
+    in every page before the site's own scripts.
+    """
+
+    def __init__(
+        self,
+        user_agent: str = DEFAULT_USER_AGENT,
+        headless: bool = True,
+        blocked_resource_types: tuple[str, ...] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        blocked_hosts: tuple[str, ...] = DEFAULT_BLOCKED_HOSTS,
+        max_navigations: int = 100,
+        max_rss_mb: int = 1500,
+        har_dir: Optional[str] = None,
+        har_mode: Optional[Literal["record", "replay"]] = None,
+        init_scripts: tuple[str, ...] = ()
+    ):
+        self.user_agent = user_agent
+        self.headless = headless
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self.blocked_hosts = tuple(blocked_hosts)
+        self.max_navigations = max_navigations
+        self.max_rss_mb = max_rss_mb
+        self.har_dir = Path(har_dir) if har_dir else None
+        self.har_mode = har_mode if har_dir else None
+        self.init_scripts = init_scripts
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        # The Playwright driver; the browser processes are its children
+        self._driver: Optional[psutil.Process] = None
+        self._slots: dict[str, _Slot] = {}
+        self._key_locks: dict[str, asyncio.Lock] = {}
+        self._start_lock = asyncio.Lock()
+        self._leases = 0
+        # Cleared while the browser waits to be relaunched
+        self._ready = asyncio.Event()
+        self._ready.set()
+        self._recorded: dict[str, int] = {}
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+            # After a failed relaunch the driver is still running; only the browser is launched again
+            if self._playwright is None:
+                children = set(psutil.Process().children())
+                self._playwright = await async_playwright().start()
+                self._driver = self._find_driver(set(psutil.Process().children()) - children)
+                if self._driver is None:
+                    logging.warning("Browser pool: Playwright driver process not found, memory limit disabled")
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            logging.info("Browser pool started")
+
+    @staticmethod
+    def _find_driver(processes: set[psutil.Process]) -> Optional[psutil.Process]:
+        for process in processes:
+            try:
+                if "run-driver" in process.cmdline():
+                    return process
+            except psutil.Error:
+                continue
+        return None
+
+    async def close(self) -> None:
+        for slot in self._slots.values():
+            await slot.context.close()
+        self._slots.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._driver = None
+
+    async def _block_unneeded(self, route: Route) -> None:
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if request.resource_type in self.blocked_resource_types or host.endswith(self.blocked_hosts):
+            await route.abort()
+        else:
+            # On to the HAR replay routes if there are any, otherwise to the network
+            await route.fallback()
+
+    def _har_files(self, key: str) -> list[Path]:
+        return sorted(self.har_dir.glob(f"{_har_stem(key)}-*.har"))
+
+    async def _new_context(self, key: str) -> BrowserContext:
+        if self.har_mode == "record":
+            # Recycled contexts of the same key get their own file
+            self._recorded[key] = self._recorded.get(key, 0) + 1
+            self.har_dir.mkdir(parents=True, exist_ok=True)
+            path = self.har_dir / f"{_har_stem(key)}-{self._recorded[key]:03d}.har"
+            return await self._browser.new_context(user_agent=self.user_agent, record_har_path=path, record_har_content="embed")
+
+        context = await self._browser.new_context(user_agent=self.user_agent)
+        if self.har_mode == "replay":
+            har_files = self._har_files(key)
+            if not har_files:
+                raise FileNotFoundError(f"No recorded HAR files for '{key}' in {self.har_dir}")
+            # Routes registered later are tried first: the recordings, then this catch-all
+            await context.route("**/*", lambda route: route.abort())
+            for path in har_files:
+                await context.route_from_har(path, not_found="fallback")
+        return context
+
+    async def _new_slot(self, key: str, cookies: Optional[list]) -> _Slot:
+        context = await self._new_context(key)
+        for script in self.init_scripts:
+            await context.add_init_script(script=script)
+        if cookies:
+            await context.add_cookies(cookies)
+        await context.route("**/*", self._block_unneeded)
+        page = await context.new_page()
+        slot = _Slot(context, page)
+
+        def count_navigation(frame) -> None:
+            if frame == page.main_frame:
+                slot.navigations += 1
+
+        page.on("framenavigated", count_navigation)
+        return slot
+
+    def rss_mb(self) -> Optional[float]:
+        """Resident memory of the Chromium processes, or None before the browser is started."""
+        if self._driver is None:
+            return None
+        total = 0
+        try:
+            browser_processes = self._driver.children(recursive=True)
+        except psutil.Error:
+            return None
+        for process in browser_processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+    async def _recycle(self, key: str, reason: str) -> None:
+        slot = self._slots.pop(key)
+        logging.info(f"Browser pool: recycling '{key}' context ({reason}; navigations={slot.navigations})")
+        await slot.context.close()
+
+    async def _relaunch(self, rss: Optional[float]) -> None:
+        """Close every context and the browser, then launch a fresh one. Called with no page leased.
+
+        If the launch fails, the pool is left without a browser and the next lease starts one.
+        """
+        try:
+            async with self._start_lock:
+                usage = f"{rss:.0f}MB" if rss is not None else "unknown"
+                logging.info(f"Browser pool: relaunching browser (rss={usage}; limit={self.max_rss_mb}MB)")
+                browser, self._browser = self._browser, None
+                try:
+                    for key in list(self._slots):
+                        await self._recycle(key, "browser relaunch")
+                    await browser.close()
+                except Exception as e:
+                    logging.warning(f"Browser pool: closing the old browser failed: {e}")
+                    self._slots.clear()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        finally:
+            self._ready.set()
+
+    @asynccontextmanager
+    async def page(self, key: str, cookies: Optional[list] = None) -> AsyncIterator[Page]:
+        """Lease the page for `key`, creating its context (with `cookies`) on first use.
+
+        Only one lease per key is active at a time; other callers for the same key wait. Contexts
+        recreated after a recycle or relaunch get `cookies` again.
+        """
+        await self.start()
+        while not self._ready.is_set():
+            await self._ready.wait()
+
+        self._leases += 1
+        try:
+            async with self._key_locks.setdefault(key, asyncio.Lock()):
+                if key not in self._slots:
+                    self._slots[key] = await self._new_slot(key, cookies)
+                slot = self._slots[key]
+
+                try:
+                    yield slot.page
+                except Exception:
+                    # The page may be left mid-navigation or crashed; start the next lease clean
+                    await self._recycle(key, "error")
+                    raise
+
+                if slot.navigations >= self.max_navigations:
+                    await self._recycle(key, "navigation limit reached")
+        finally:
+            self._leases -= 1
+
+        rss = self.rss_mb()
+        if rss is not None and rss > self.max_rss_mb:
+            self._ready.clear()
+        # The last lease out relaunches the browser; the others wait for it in the loop above
+        if not self._ready.is_set() and self._leases == 0:
+            await self._relaunch(rss)
@@ -0,0 +1,158 @@
+"""Bulk export of the companies table to Parquet / Arrow IPC files and import back from them.
+
+Both directions go through ADBC, which moves Arrow data in and out of Postgres with binary COPY,
+so no row passes through the ORM. An export streams record batches straight to the file; an import
+loads the file into a temporary staging table and merges it into `companies` on `name` with a
+handful of set-based statements.
+"""
+import datetime
+import logging
+from pathlib import Path
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet
+from adbc_driver_postgresql import dbapi, StatementOptions
+
+from config import settings
+
+FORMATS = ("parquet", "arrow")
+EXPORT_COLUMNS = (
+    "id::text AS id, name, location, description, link, normalized_name, source, content_hash, created_at, updated_at"
+)
+STAGING_TABLE = "companies_import"
+# Rows are fetched and written in record batches of about this size
+BATCH_SIZE_BYTES = 16 * 1024 * 1024
+IMPORT_WORK_MEM = "256MB"
+
+# Rows are deduplicated by name, newest first, so every name is merged once
+STAGED_ROWS = f"""
+    SELECT DISTINCT ON (name)
+        id, name, location, description, link, normalized_name, source,
+        coalesce(content_hash, md5(location || chr(31) || description || chr(31) || link)) AS content_hash,
+        coalesce(created_at, now()) AS created_at, updated_at
+    FROM {STAGING_TABLE}
+    ORDER BY name, coalesce(updated_at, created_at) DESC NULLS LAST
+"""
+
+MERGE_STATEMENTS = (
+    # Keep the version about to be overwritten, as the incremental upsert does
+    f"""
+    INSERT INTO company_history (company_id, location, description, link, content_hash, valid_from, valid_to)
+    SELECT c.id, c.location, c.description, c.link, c.content_hash, coalesce(c.updated_at, c.created_at), now()
+    FROM companies c JOIN ({STAGED_ROWS}) s ON s.name = c.name
+    WHERE c.source = coalesce(s.source, 'ycombinator') AND s.content_hash <> c.content_hash
+    """,
+    f"""
+    INSERT INTO companies (id, name, location, description, link, normalized_name, source, content_hash, created_at, updated_at)
+    SELECT
+        CASE WHEN s.id IS NULL OR EXISTS (SELECT 1 FROM companies c WHERE c.id = s.id::uuid)
+             THEN gen_random_uuid() ELSE s.id::uuid END,
+        s.name, s.location, s.description, s.link, s.normalized_name, coalesce(s.source, 'ycombinator'),
+        s.content_hash, s.created_at, s.updated_at
+    FROM ({STAGED_ROWS}) s
+    ON CONFLICT (name) DO UPDATE SET
+        location = excluded.location,
+        description = excluded.description,
+        link = excluded.link,
+        content_hash = excluded.content_hash,
+        updated_at = now()
+    WHERE companies.source = excluded.source AND companies.content_hash <> excluded.content_hash
+    RETURNING xmax = 0 AS inserted
+    """,
+    # Every imported row is its source's card of the company, like a freshly scraped one. Only the
+    # company's own source rewrites the company above; other sources' rows are kept here.
+    f"""
+    INSERT INTO company_sources (id, company_id, source, name, location, description, link, content_hash, created_at)
+    SELECT gen_random_uuid(), c.id, coalesce(s.source, 'ycombinator'), s.name, s.location, s.description, s.link,
+           s.content_hash, s.created_at
+    FROM companies c JOIN ({STAGED_ROWS}) s ON s.name = c.name
+    ON CONFLICT (source, name) DO UPDATE SET
+        location = excluded.location,
+        description = excluded.description,
+        link = excluded.link,
+        content_hash = excluded.content_hash,
+        updated_at = now()
+    WHERE company_sources.content_hash <> excluded.content_hash
+    """,
+)
+
+
+def detect_format(path: str, file_format: Optional[str] = None) -> str:
+    """`file_format` if given, otherwise "parquet" for .parquet files and "arrow" for anything else."""
+    if file_format:
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown format {file_format!r}, expected one of {FORMATS}")
+        return file_format
+    return "parquet" if Path(path).suffix == ".parquet" else "arrow"
+
+
+def export_companies(
+    path: str,
+    file_format: Optional[str] = None,
+    created_from: Optional[datetime.datetime] = None,
+    created_to: Optional[datetime.datetime] = None
+) -> int:
+    """Write companies created in [created_from, created_to) to `path`. Return the number of rows."""
+    conditions, params = [], []
+    if created_from is not None:
+        params.append(created_from)
+        conditions.append(f"created_at >= ${len(params)}")
+    if created_to is not None:
+        params.append(created_to)
+        conditions.append(f"created_at < ${len(params)}")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    rows = 0
+    with dbapi.connect(settings.get_db_uri()) as conn:
+        with conn.cursor() as cursor:
+            cursor.adbc_statement.set_options(**{StatementOptions.BATCH_SIZE_HINT_BYTES.value: str(BATCH_SIZE_BYTES)})
+            cursor.execute(f"SELECT {EXPORT_COLUMNS} FROM companies {where} ORDER BY created_at", tuple(params))
+            reader = cursor.fetch_record_batch()
+            if detect_format(path, file_format) == "parquet":
+                writer = pyarrow.parquet.ParquetWriter(path, reader.schema)
+            else:
+                writer = pyarrow.ipc.new_file(path, reader.schema)
+            with writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+
+    logging.info(f"Exported {rows} companies to {path}")
+    return rows
+
+
+def _read_batches(path: str, file_format: str) -> pa.RecordBatchReader:
+    if file_format == "parquet":
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        return pa.RecordBatchReader.from_batches(parquet_file.schema_arrow, parquet_file.iter_batches())
+    # Memory-mapped, so batches are paged in as the ingest reads them
+    ipc_file = pyarrow.ipc.open_file(pa.memory_map(path))
+    return pa.RecordBatchReader.from_batches(
+        ipc_file.schema, (ipc_file.get_batch(i) for i in range(ipc_file.num_record_batches))
+    )
+
+
+def import_companies(path: str, file_format: Optional[str] = None) -> tuple[int, int]:
+    """Load an exported file and merge it into companies on name in one transaction.
+
+    New names are inserted, existing ones updated when their content changed. Return (inserted, updated).
+    """
+    reader = _read_batches(path, detect_format(path, file_format))
+    with dbapi.connect(settings.get_db_uri()) as conn:
+        with conn.cursor() as cursor:
+            staged = cursor.adbc_ingest(STAGING_TABLE, reader, mode="create", temporary=True)
+            cursor.execute(f"ANALYZE {STAGING_TABLE}")
+            # Lets the dedupe sort of a large file run in memory instead of spilling to disk
+            cursor.execute(f"SET LOCAL work_mem = '{IMPORT_WORK_MEM}'")
+            history, merge, sources = MERGE_STATEMENTS
+            cursor.execute(history)
+            cursor.execute(merge)
+            merged = cursor.fetch_arrow_table()["inserted"].to_pylist()
+            cursor.execute(sources)
+        conn.commit()
+
+    inserted = sum(merged)
+    logging.info(f"Imported {staged} rows from {path}: {inserted} new companies, {len(merged) - inserted} updated")
+    return inserted, len(merged) - inserted
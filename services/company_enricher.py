@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from typing import Iterable, NamedTuple, Optional
+from uuid import UUID
+
+import aiohttp
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from db.dao.company_details_dao import CompanyDetailsDAO
+from services.detail_parser import CompanyDetailsRecord, parse_yc_details
+from services.http_cache import CachedResponse, HttpCache
+from services.metrics import ENRICHMENT_RESPONSES, timed, timed_db
+from services.rate_limiter import HostRateLimiter
+
+USER_AGENT = "Mozilla/5.0 (compatible; company-enricher)"
+EMPTY_DETAILS = CompanyDetailsRecord(None, None, None, (), ())
+
+
+class EnrichmentTarget(NamedTuple):
+    company_id: UUID
+    link: str
+
+
+def _targets(rows: Iterable[tuple[UUID, str]]) -> list[EnrichmentTarget]:
+    """One target per company; a company merged from two YC cards has two links."""
+    return list({company_id: EnrichmentTarget(company_id, link) for company_id, link in rows}.values())
+
+
+class CompanyEnricher:
+    """Fetches the YC pages of stored companies and saves the details parsed from them to company_details.
+
+    Pages are fetched concurrently over one pooled aiohttp session, at most `concurrency` at a time
+    and within the optional per-host rate limit. Responses are kept in `cache` with their validators
+    and revalidated on the next fetch, so an unchanged page costs a 304 instead of a download.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        cache: HttpCache,
+        concurrency: int = 8,
+        timeout: float = 30.0,
+        batch_size: int = 200,
+        rate_limiter: Optional[HostRateLimiter] = None
+    ):
+        self.session_maker = session_maker
+        self.cache = cache
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.rate_limiter = rate_limiter
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._http: Optional[aiohttp.ClientSession] = None
+
+    def _client(self) -> aiohttp.ClientSession:
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._http
+
+    async def close(self) -> None:
+        if self._http is not None:
+            await self._http.close()
+
+    async def fetch(self, url: str, refresh: bool = False) -> Optional[str]:
+        """Body of `url`, "" if the page is gone, or None if `refresh` is set and the cached page is current."""
+        cached = await asyncio.to_thread(self.cache.get, url)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(url)
+
+        with timed("enrichment", "fetch"):
+            async with self._client().get(url, headers=cached.validators() if cached else None) as response:
+                if response.status == 304 and cached is not None:
+                    ENRICHMENT_RESPONSES.labels("not_modified").inc()
+                    return None if refresh else cached.body
+                if response.status in (404, 410):
+                    ENRICHMENT_RESPONSES.labels("gone").inc()
+                    return ""
+                response.raise_for_status()
+                body = await response.text()
+                etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+        ENRICHMENT_RESPONSES.labels("fetched").inc()
+        if etag or last_modified:
+            await asyncio.to_thread(self.cache.put, CachedResponse(url, body, etag, last_modified))
+        return body
+
+    async def _fetch_details(self, target: EnrichmentTarget, refresh: bool) -> Optional[dict]:
+        async with self._semaphore:
+            try:
+                body = await self.fetch(target.link, refresh)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                ENRICHMENT_RESPONSES.labels("error").inc()
+                logging.warning(f"Enrichment of {target.link} failed: {e!r}")
+                return None
+        if body is None:
+            return None
+
+        with timed("enrichment", "parse"):
+            details = parse_yc_details(body) if body else None
+        if details is None:
+            # Saved empty, so the company is not fetched again on every run
+            logging.info(f"No company details on {target.link}")
+            details = EMPTY_DETAILS
+        return {"company_id": target.company_id, **details._asdict(), "founders": list(details.founders), "tags": list(details.tags)}
+
+    async def fetch_all(self, targets: Iterable[EnrichmentTarget], refresh: bool = False) -> list[dict]:
+        """Details rows for the targets whose pages were fetched; failed and unchanged pages are left out."""
+        rows = await asyncio.gather(*(self._fetch_details(target, refresh) for target in targets))
+        return [row for row in rows if row is not None]
+
+    async def enrich(self, targets: list[EnrichmentTarget], refresh: bool = False) -> int:
+        """Fetch and save the details of `targets`. Return the number of companies saved."""
+        rows = await self.fetch_all(targets, refresh)
+        with timed_db("save_details"):
+            async with self.session_maker() as session:
+                await CompanyDetailsDAO(session).upsert_many(rows)
+        return len(rows)
+
+    async def enrich_pending(self) -> int:
+        """Enrich companies without details, newest first, until none are left or a batch has failures."""
+        total = 0
+        while True:
+            async with self.session_maker() as session:
+                targets = _targets(await CompanyDetailsDAO(session).get_pending(self.batch_size))
+            if not targets:
+                break
+            saved = await self.enrich(targets)
+            total += saved
+            logging.info(f"Enriched {saved} of {len(targets)} companies")
+            if saved < len(targets):
+                # The failed ones are retried on the next run
+                break
+        return total
+
+    async def refresh_all(self) -> int:
+        """Revalidate the pages of all enriched companies and save the ones that changed."""
+        total, after = 0, None
+        while True:
+            async with self.session_maker() as session:
+                targets = _targets(await CompanyDetailsDAO(session).get_enriched(after, self.batch_size))
+            if not targets:
+                break
+            total += await self.enrich(targets, refresh=True)
+            after = targets[-1].company_id
+        return total
+
+    async def run(self, interval: float) -> None:
+        """Enrich newly inserted companies every `interval` seconds."""
+        while True:
+            try:
+                await self.enrich_pending()
+            except Exception as e:
+                logging.error(f"Enrichment error: {e}")
+            await asyncio.sleep(interval)
@@ -1,28 +1,202 @@
 import logging
-from typing import Optional
+from typing import Iterable, Optional
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from db.dao.company_dao import CompanyDAO
-from db.models import Company
+from db.dao.company_stats_dao import CompanyStatsDAO
+from db.models import Company, CompanySource
+from services.entity_resolution import EntityResolver, normalize_name, resolve_clusters, ResolutionRow
+from services.known_company_index import KnownCompanyIndex
+from services.metrics import COMPANIES_UPDATED, timed_db
+from services.records import CompanyRecord, content_hash
 
 
 class CompanyService:
-    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        known_index: Optional[KnownCompanyIndex] = None,
+        resolver: Optional[EntityResolver] = None
+    ):
         self.session_maker = session_maker
+        self.known_index = known_index
+        self.resolver = resolver
 
-    async def create_new(self, name: str, location: str, description: str, link: str) -> None:
+    async def warm_known_index(self) -> None:
+        """Fill the known-company index from the company_sources table with a single query."""
+        if self.known_index is None:
+            return
+
+        with timed_db("warm_known_index"):
+            async with self.session_maker() as session:
+                company_dao = CompanyDAO(session)
+                rows = await company_dao.get_recent_source_hashes(self.known_index.max_size)
+
+        # Oldest first, so the newest cards end up most recently used
+        self.known_index.update(((source, name), content_hash) for source, name, content_hash in reversed(rows))
+        logging.info(f"Known-company index warmed with {len(self.known_index)} cards")
+
+    async def warm_resolver(self) -> None:
+        """Register every stored company and each source's spelling of it with the entity resolver."""
+        if self.resolver is None:
+            return
+
+        with timed_db("warm_resolver"):
+            async with self.session_maker() as session:
+                company_dao = CompanyDAO(session)
+                rows = await company_dao.get_source_names()
+
+        for company_name, name, link, source in rows:
+            self.resolver.add(company_name, name, link, source)
+        logging.info(f"Entity resolver warmed with {len(self.resolver)} companies")
+
+    async def create_new(self, name: str, location: str, description: str, link: str, source: str) -> None:
         async with self.session_maker() as session:
             company_dao = CompanyDAO(session)
             company_obj = Company(
                 name=name,
                 location=location,
                 description=description,
-                link=link
+                link=link,
+                normalized_name=normalize_name(name),
+                source=source,
+                content_hash=content_hash(location, description, link),
+                sources=[CompanySource(
+                    source=source,
+                    name=name,
+                    location=location,
+                    description=description,
+                    link=link,
+                    content_hash=content_hash(location, description, link)
+                )]
             )
 
-            data = await company_dao.create_new(company_obj)
+            with timed_db("create_new"):
+                data = await company_dao.create_new(company_obj)
             logging.info(f"Created Company: id={data.id}; name={data.name}; location={data.location}; description={data.description}; link={data.link}")
 
+        if self.known_index is not None:
+            self.known_index.add((source, data.name), data.content_hash)
+
     async def get_by_name(self, company_name: str) -> Optional[Company]:
         async with self.session_maker() as session:
             company_dao = CompanyDAO(session)
-            return await company_dao.get_by_name(company_name)
\ No newline at end of file
+            with timed_db("get_by_name"):
+                return await company_dao.get_by_name(company_name)
+
+    def filter_unknown(self, records: Iterable[CompanyRecord]) -> list[CompanyRecord]:
+        """Drop records that are already known to be stored with the same content."""
+        if self.known_index is None:
+            return list(records)
+        return [
+            record for record in records
+            if not self.known_index.is_current((record.source, record.name), record.content_hash)
+        ]
+
+    async def upsert_many(self, records: Iterable[CompanyRecord], skip_known: bool = True) -> list[Company]:
+        """Save a batch of records in one transaction, rewriting companies whose content changed.
+
+        Return only the companies that were new.
+
+        Pass skip_known=False when the records were already run through `filter_unknown`.
+        """
+        records = self.filter_unknown(records) if skip_known else list(records)
+        if not records:
+            return []
+
+        companies, sources = self._resolve(records)
+        with timed_db("upsert_many"):
+            async with self.session_maker() as session:
+                company_dao = CompanyDAO(session)
+                created, updated = await company_dao.upsert_many(companies, sources)
+
+        # Only now, so a failed batch leaves no companies in the resolver that were never stored
+        if self.resolver is not None:
+            for source in sources:
+                self.resolver.add(source["company_name"], source["name"], source["link"], source["source"])
+
+        # Every card in the batch is stored now with this content, whether it was written or not
+        if self.known_index is not None:
+            self.known_index.update(((record.source, record.name), record.content_hash) for record in records)
+
+        for data in created:
+            logging.info(f"Created Company: id={data.id}; name={data.name}; location={data.location}; description={data.description}; link={data.link}")
+        for data in updated:
+            logging.info(f"Updated Company: id={data.id}; name={data.name}; location={data.location}; description={data.description}; link={data.link}")
+        COMPANIES_UPDATED.inc(len(updated))
+        return created
+
+    def _resolve(self, records: list[CompanyRecord]) -> tuple[list[dict], list[dict]]:
+        """Split records into company rows to insert and source rows, each naming its company.
+
+        A record the resolver matches to another company only adds a source row to that company.
+        Records are matched against the stored companies first, then against the rest of the batch.
+        """
+        companies, sources = [], []
+        batch_resolver = None
+        if self.resolver is not None:
+            batch_resolver = EntityResolver(self.resolver.threshold, self.resolver.max_block_size)
+        for record in records:
+            company_name = record.name
+            if self.resolver is not None:
+                matched = self.resolver.match(record.name, record.link, record.source)
+                if matched is None:
+                    matched = batch_resolver.match(record.name, record.link, record.source)
+                if matched is not None and matched != record.name:
+                    logging.info(f"Resolved {record.source} company '{record.name}' to '{matched}'")
+                    company_name = matched
+                batch_resolver.add(company_name, record.name, record.link, record.source)
+
+            if company_name == record.name:
+                companies.append({
+                    "name": record.name,
+                    "location": record.location,
+                    "description": record.description,
+                    "link": record.link,
+                    "normalized_name": normalize_name(record.name),
+                    "source": record.source,
+                    "content_hash": record.content_hash,
+                })
+            sources.append({
+                "company_name": company_name,
+                "source": record.source,
+                "name": record.name,
+                "location": record.location,
+                "description": record.description,
+                "link": record.link,
+                "content_hash": record.content_hash,
+            })
+        return companies, sources
+
+    async def resolve_all(self, dry_run: bool = False) -> int:
+        """Re-run entity resolution over all stored companies and merge the duplicates it finds.
+
+        Also refreshes `normalized_name`. Return the number of companies merged away.
+        """
+        with timed_db("resolve_all"):
+            async with self.session_maker() as session:
+                company_dao = CompanyDAO(session)
+                rows = await company_dao.get_resolution_rows()
+
+                normalized_names = {}
+                resolution_rows = []
+                for company_id, name, link, normalized_name, sources in rows:
+                    normalized = normalize_name(name)
+                    if normalized != normalized_name:
+                        normalized_names[company_id] = normalized
+                    resolution_rows.append(ResolutionRow(company_id, name, link, tuple(sources)))
+
+                names = {row.key: row.name for row in resolution_rows}
+                clusters = [cluster for cluster in resolve_clusters(resolution_rows) if len(cluster) > 1]
+                for cluster in clusters:
+                    logging.info(f"Merging {[names[key] for key in cluster[1:]]} into '{names[cluster[0]]}'")
+
+                if not dry_run:
+                    await company_dao.merge_companies(clusters, normalized_names)
+
+        return sum(len(cluster) - 1 for cluster in clusters)
+
+    async def rebuild_daily_stats(self) -> int:
+        """Recompute the company_daily_stats rollup, e.g. after a TRUNCATE or a restore. Return the number of buckets."""
+        with timed_db("rebuild_daily_stats"):
+            async with self.session_maker() as session:
+                return await CompanyStatsDAO(session).rebuild()
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from services.company_service import CompanyService
+from services.metrics import WRITER_BATCH_SECONDS, WRITER_QUEUE_DEPTH
+from services.records import CompanyRecord
+
+# Called from the writer task with True once every record of a `put_many` call is written, False if any failed
+OnWritten = Callable[[bool], Awaitable[None]]
+
+
+class _Put:
+    """One `put_many` call waiting for its records to be written."""
+
+    def __init__(self, on_written: OnWritten):
+        self.on_written = on_written
+        self.failed = False
+
+
+class CompanyWriter:
+    """Write-behind stage between the parsers and the database.
+
+    Parsers push records into a bounded queue and carry on; a single writer task drains it in
+    batches, flushing when `batch_size` records are waiting or `flush_ms` has passed since the
+    first one arrived. A full queue makes `put_many` wait, which holds the scrapers back.
+    Callers that must not move on before their records are stored (crawl signatures and
+    checkpoints) pass `on_written` and act on the outcome instead.
+    """
+
+    def __init__(
+        self,
+        company_service: CompanyService,
+        batch_size: int = 500,
+        flush_ms: int = 500,
+        max_queue: int = 5000
+    ):
+        self.company_service = company_service
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        # A record with the call it came from, or (None, call) marking the end of that call's records
+        self.queue: asyncio.Queue[tuple[Optional[CompanyRecord], Optional[_Put]]] = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.written = 0
+        self.created = 0
+        self.last_batch_ms = 0.0
+
+    async def put_many(self, records: Iterable[CompanyRecord], on_written: Optional[OnWritten] = None) -> int:
+        """Queue records that are not known to be stored yet. Return how many were queued.
+
+        `on_written` is awaited by the writer task once all of them are written, or failed to be,
+        after everything queued before them. It is called even when nothing needed queueing.
+        """
+        records = self.company_service.filter_unknown(records)
+        put = _Put(on_written) if on_written is not None else None
+        for record in records:
+            await self.queue.put((record, put))
+        if put is not None:
+            await self.queue.put((None, put))
+        WRITER_QUEUE_DEPTH.set(self.queue.qsize())
+        return len(records)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        """Flush everything still queued, then stop the writer task."""
+        if self._task is None:
+            return
+        await self.queue.join()
+        self._task.cancel()
+        self._task = None
+
+    async def _next_batch(self) -> list[tuple[Optional[CompanyRecord], Optional[_Put]]]:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.flush_ms / 1000
+
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: list[tuple[Optional[CompanyRecord], Optional[_Put]]]) -> None:
+        try:
+            records = [record for record, _ in batch if record is not None]
+            if records and not await self._write(records):
+                for _, put in batch:
+                    if put is not None:
+                        put.failed = True
+            for record, put in batch:
+                if record is None:
+                    await self._confirm(put)
+        finally:
+            for _ in batch:
+                self.queue.task_done()
+
+    async def _write(self, records: list[CompanyRecord]) -> bool:
+        start = time.perf_counter()
+        try:
+            created = await self.company_service.upsert_many(records, skip_known=False)
+        except Exception as e:
+            # Callers waiting on these records are told they failed, so their pages get parsed again
+            logging.error(f"Company writer: failed to write {len(records)} records: {e}")
+            return False
+
+        self.last_batch_ms = (time.perf_counter() - start) * 1000
+        WRITER_BATCH_SECONDS.observe(self.last_batch_ms / 1000)
+        WRITER_QUEUE_DEPTH.set(self.queue.qsize())
+        self.batches += 1
+        self.written += len(records)
+        self.created += len(created)
+        logging.info(f"Company writer: wrote {len(records)} records ({len(created)} new) in {self.last_batch_ms:.1f}ms; queue depth={self.queue.qsize()}")
+        return True
+
+    async def _confirm(self, put: _Put) -> None:
+        try:
+            await put.on_written(not put.failed)
+        except Exception as e:
+            logging.error(f"Company writer: write callback failed: {e}")
+
+    async def run(self) -> None:
+        while True:
+            await self._flush(await self._next_batch())
@@ -0,0 +1,49 @@
+import logging
+from typing import NamedTuple, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from db.dao.crawl_checkpoint_dao import CrawlCheckpointDAO
+from services.metrics import timed_db
+
+
+class Checkpoint(NamedTuple):
+    """Where a crawl cycle of one target got to. Page 0 means nothing has been completed yet."""
+
+    target_key: str
+    cycle_id: UUID
+    page_number: int = 0
+    card_count: int = 0
+    last_card: Optional[str] = None
+    completed: bool = False
+
+    @classmethod
+    def new_cycle(cls, target_key: str) -> "Checkpoint":
+        return cls(target_key, uuid4())
+
+
+class CheckpointStore:
+    """Persists crawl checkpoints so a failed or interrupted cycle resumes where it stopped."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+
+    async def start_cycle(self, target_key: str) -> Checkpoint:
+        """The unfinished cycle of `target_key` if there is one, otherwise a new cycle from the start."""
+        with timed_db("checkpoint_load"):
+            async with self.session_maker() as session:
+                stored = await CrawlCheckpointDAO(session).get(target_key)
+
+        if stored is None or stored.completed:
+            return Checkpoint.new_cycle(target_key)
+
+        logging.info(f"{target_key}: resuming cycle {stored.cycle_id} after page {stored.page_number} ({stored.card_count} cards)")
+        return Checkpoint(
+            stored.target_key, stored.cycle_id, stored.page_number, stored.card_count, stored.last_card, stored.completed
+        )
+
+    async def save(self, checkpoint: Checkpoint) -> None:
+        with timed_db("checkpoint_save"):
+            async with self.session_maker() as session:
+                await CrawlCheckpointDAO(session).save(checkpoint._asdict())
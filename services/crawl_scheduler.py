@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import Optional
+
+from config import CrawlTarget
+from services.metrics import CRAWL_CYCLES, timed
+from services.profiling import CycleProfiler
+from services.stream_scraper_service import StreamScraperService
+
+
+class AdaptiveInterval:
+    """Polling delay that doubles while nothing changes and resets once new companies appear."""
+
+    def __init__(self, base: float, maximum: float, backoff: float = 2.0):
+        self.base = base
+        self.maximum = max(base, maximum)
+        self.backoff = backoff
+        self.current = base
+
+    def update(self, changed: bool) -> float:
+        self.current = self.base if changed else min(self.maximum, self.current * self.backoff)
+        return self.current
+
+
+async def crawl_once(scraper: StreamScraperService, target: CrawlTarget, profiler: Optional[CycleProfiler] = None) -> int:
+    """Crawl `target` once, timing and counting the cycle. Return total new companies."""
+    try:
+        with timed(target.source, "cycle"):
+            if profiler is None:
+                new_companies = await scraper.crawl(target)
+            else:
+                async with profiler.profile(target.key):
+                    new_companies = await scraper.crawl(target)
+    except Exception:
+        CRAWL_CYCLES.labels(target.source, "error").inc()
+        raise
+
+    CRAWL_CYCLES.labels(target.source, "changed" if new_companies > 0 else "unchanged").inc()
+    return new_companies
+
+
+class CrawlScheduler:
+    """Runs every crawl target on its own re-crawl interval, at most `max_concurrency` crawls at a time."""
+
+    def __init__(
+        self,
+        scraper: StreamScraperService,
+        targets: list[CrawlTarget],
+        max_concurrency: int = 4,
+        retry_delay: float = 3.0,
+        profiler: Optional[CycleProfiler] = None
+    ):
+        self.scraper = scraper
+        self.targets = targets
+        self.max_concurrency = max_concurrency
+        self.retry_delay = retry_delay
+        self.profiler = profiler
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run_target(self, target: CrawlTarget) -> None:
+        interval = AdaptiveInterval(target.interval, target.max_interval)
+        while True:
+            try:
+                async with self._semaphore:
+                    new_companies = await crawl_once(self.scraper, target, self.profiler)
+            except Exception as e:
+                logging.error(f"{target.key} error: {e}")
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            delay = interval.update(new_companies > 0)
+            logging.info(f"{target.key}: next crawl in {delay:.0f}s")
+            await asyncio.sleep(delay)
+
+    async def run(self) -> None:
+        logging.info(f"Crawl scheduler: {len(self.targets)} targets; concurrency={self.max_concurrency}")
+        await asyncio.gather(*(self._run_target(target) for target in self.targets))
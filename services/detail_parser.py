@@ -0,0 +1,48 @@
+"""Company fields from Y Combinator company pages (https://www.ycombinator.com/companies/<slug>).
+
+The pages are rendered client-side from a JSON document embedded in a `data-page` attribute, so the
+fields are read from that JSON instead of from the markup.
+"""
+import html
+import json
+import re
+from typing import NamedTuple, Optional
+
+DATA_PAGE = re.compile(r'data-page="([^"]*)"')
+
+
+class CompanyDetailsRecord(NamedTuple):
+    website: Optional[str]
+    team_size: Optional[int]
+    year_founded: Optional[int]
+    founders: tuple[str, ...]
+    tags: tuple[str, ...]
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_yc_details(page: str) -> Optional[CompanyDetailsRecord]:
+    """Details of the company on a YC company page, or None if the page has no company data."""
+    for match in DATA_PAGE.finditer(page):
+        try:
+            props = json.loads(html.unescape(match.group(1))).get("props") or {}
+        except (ValueError, AttributeError):
+            continue
+        company = props.get("company")
+        if not isinstance(company, dict):
+            continue
+
+        founders = company.get("founders") or []
+        return CompanyDetailsRecord(
+            website=company.get("website") or None,
+            team_size=_int(company.get("team_size")),
+            year_founded=_int(company.get("year_founded")),
+            founders=tuple(founder["full_name"] for founder in founders if isinstance(founder, dict) and founder.get("full_name")),
+            tags=tuple(tag for tag in company.get("tags") or [] if isinstance(tag, str)),
+        )
+    return None
@@ -0,0 +1,161 @@
+import re
+import unicodedata
+from typing import AbstractSet, Hashable, Iterable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+BATCH_TAG = re.compile(r'\(\s*YC\s+[A-Z]+\d{2}\s*\)', re.IGNORECASE)
+NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+DIGITS = re.compile(r'\d+')
+LEGAL_SUFFIXES = frozenset({
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+    "gmbh", "ag", "sa", "sas", "bv", "oy", "ab", "pbc", "plc", "pte", "pty",
+})
+# Path prefixes of company pages on the scraped sites: /companies/<slug> (YC), /company/<slug>/ (LinkedIn)
+COMPANY_PATH_PREFIXES = frozenset({"companies", "company"})
+PREFIX_LENGTH = 4
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase ASCII words without batch tags, punctuation or trailing legal suffixes."""
+    name = BATCH_TAG.sub(" ", name)
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    words = NON_ALPHANUMERIC.sub(" ", name.replace("&", " and ")).split()
+    # "Acme & Co" -> "acme"
+    while len(words) > 1 and (words[-1] in LEGAL_SUFFIXES or words[-1] == "and"):
+        words.pop()
+    return " ".join(words)
+
+
+def link_slug(link: str) -> Optional[str]:
+    """The company slug of a YC or LinkedIn company link, normalized like a name."""
+    segments = urlsplit(link).path.strip("/").split("/")
+    if len(segments) < 2 or segments[0] not in COMPANY_PATH_PREFIXES:
+        return None
+    return normalize_name(segments[1].replace("-", " ")) or None
+
+
+def trigrams(text: str) -> set[str]:
+    """Word trigrams padded the way pg_trgm pads them."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a: AbstractSet[str], b: AbstractSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Entity(NamedTuple):
+    trigrams: frozenset[str]
+    numbers: list[str]
+    # Raw names the company is known by, per source
+    names: dict[str, set[str]]
+
+
+class EntityResolver:
+    """Matches company records to already known companies, across sources.
+
+    A record matches a company with the same normalized name, or the same link slug (a YC slug
+    and a LinkedIn slug of the same company usually agree). Otherwise it is compared by trigram
+    similarity with the companies in its block, those whose normalized names share the first
+    few characters, so matching stays close to linear. Two differently named records from the
+    same source are two companies, so such a pair never matches, not even exactly ("Acme Inc"
+    and "Acme" on YC). Fuzzy matches also need the numbers in both names to agree ("Acme 2"
+    is not "Acme 3").
+    """
+
+    def __init__(self, threshold: float = 0.7, max_block_size: int = 500):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self._entities: dict[Hashable, _Entity] = {}
+        self._names: dict[str, list[Hashable]] = {}
+        self._slugs: dict[str, list[Hashable]] = {}
+        self._blocks: dict[str, list[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def add(self, key: Hashable, name: str, link: str, source: str) -> None:
+        """Register a company under `key`, or add another source's spelling to it."""
+        normalized = normalize_name(name)
+        entity = self._entities.get(key)
+        if entity is None:
+            entity = self._entities[key] = _Entity(frozenset(trigrams(normalized)), DIGITS.findall(normalized), {})
+            self._blocks.setdefault(normalized[:PREFIX_LENGTH], []).append(key)
+        entity.names.setdefault(source, set()).add(name)
+
+        self._index(self._names, normalized, key)
+        slug = link_slug(link)
+        if slug:
+            self._index(self._slugs, slug, key)
+
+    @staticmethod
+    def _index(index: dict[str, list[Hashable]], value: str, key: Hashable) -> None:
+        keys = index.setdefault(value, [])
+        if key not in keys:
+            keys.append(key)
+
+    def _same_source_conflict(self, key: Hashable, name: str, source: str) -> bool:
+        names = self._entities[key].names.get(source)
+        return names is not None and name not in names
+
+    def _knows_name(self, key: Hashable, name: str) -> bool:
+        return any(name in names for names in self._entities[key].names.values())
+
+    def match(self, name: str, link: str, source: str) -> Optional[Hashable]:
+        """Key of the company this record belongs to, or None if it is a new company."""
+        normalized = normalize_name(name)
+        slug = link_slug(link)
+        candidates = [
+            key for key in [*self._names.get(normalized, ()), *self._slugs.get(slug, ())]
+            if not self._same_source_conflict(key, name, source)
+        ]
+        if candidates:
+            # Prefer a company some source spells exactly like this record
+            return next((key for key in candidates if self._knows_name(key, name)), candidates[0])
+
+        block = self._blocks.get(normalized[:PREFIX_LENGTH], ())
+        if len(block) > self.max_block_size:
+            return None
+        grams = trigrams(normalized)
+        numbers = DIGITS.findall(normalized)
+        best, best_score = None, self.threshold
+        for key in block:
+            entity = self._entities[key]
+            if source in entity.names or entity.numbers != numbers:
+                continue
+            score = similarity(grams, entity.trigrams)
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+
+class ResolutionRow(NamedTuple):
+    key: Hashable
+    name: str
+    link: str
+    sources: tuple[str, ...]
+
+
+def resolve_clusters(rows: Iterable[ResolutionRow], resolver: Optional[EntityResolver] = None) -> list[list[Hashable]]:
+    """Group rows that belong to the same company.
+
+    Pass rows oldest first: each cluster starts with its oldest row, which is the one to keep.
+    """
+    resolver = resolver or EntityResolver()
+    clusters: dict[Hashable, list[Hashable]] = {}
+    for row in rows:
+        matched = None
+        for source in row.sources:
+            matched = resolver.match(row.name, row.link, source)
+            if matched is not None:
+                break
+        cluster = row.key if matched is None else matched
+        clusters.setdefault(cluster, []).append(row.key)
+        for source in row.sources:
+            resolver.add(cluster, row.name, row.link, source)
+    return list(clusters.values())
@@ -0,0 +1,288 @@
+"""Company card extractors for the Y Combinator directory and LinkedIn search results.
+
+Every backend returns the same `CompanyRecord` tuples for the same HTML; they differ only in speed.
+`get_parser()` picks the fastest one installed: selectolax, then lxml, then BeautifulSoup.
+"""
+import re
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from services.records import CompanyRecord
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    SelectolaxHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+    etree = None
+
+
+# BeautifulSoup class filters
+YC_CARD_CLASS = re.compile(r'.*_company.*')
+YC_NAME_CLASS = re.compile(r'.*coName.*')
+YC_LOCATION_CLASS = re.compile(r'.*coLocation.*')
+YC_DESCRIPTION_CLASS = re.compile(r'.*text-sm.*')
+LINKEDIN_NAME_CLASS = "t-roman t-sans"
+LINKEDIN_LOCATION_CLASS = re.compile(r'.*t-14 t-black t-normal.*')
+LINKEDIN_DESCRIPTION_CLASS = re.compile(r'.*entity-result__summary--2-lines.*')
+
+# CSS selectors (selectolax)
+YC_CARD_CSS = 'a[class*="_company"]'
+YC_NAME_CSS = 'span[class*="coName"]'
+YC_LOCATION_CSS = 'span[class*="coLocation"]'
+YC_DESCRIPTION_CSS = 'div[class*="text-sm"]'
+LINKEDIN_LIST_CSS = 'ul[role="list"]'
+LINKEDIN_NAME_CSS = 'div[class="t-roman t-sans"]'
+LINKEDIN_LOCATION_CSS = 'div[class*="t-14 t-black t-normal"]'
+LINKEDIN_DESCRIPTION_CSS = 'p[class*="entity-result__summary--2-lines"]'
+
+# Shared text post-processing
+LINKEDIN_LOCATION_PATTERN = re.compile(r'•\s*([^\n<]+?)(?=<|$)')
+LINKEDIN_BATCH_TAG = re.compile(r'\s*\(YC [A-Z]+\d{2}\)')
+
+
+def _yc_record(
+    name: Optional[str],
+    location: Optional[str],
+    description: Optional[str],
+    href: Optional[str],
+    base_url: str
+) -> Optional[CompanyRecord]:
+    """Build a YC record from stripped card texts. Cards without a name are skipped."""
+    if not name:
+        return None
+    link = f"{base_url}{href}" if href and href.strip() else "N/A"
+    return CompanyRecord(name, location or "N/A", description or "N/A", link, "ycombinator")
+
+
+def _linkedin_record(
+    name: Optional[str],
+    location: Optional[str],
+    description: Optional[str],
+    href: Optional[str]
+) -> CompanyRecord:
+    """Build a LinkedIn record from stripped card texts."""
+    location_text = "N/A"
+    if location:
+        match = LINKEDIN_LOCATION_PATTERN.search(location)
+        location_text = match.group(1).strip() if match else "N/A"
+
+    name_text = LINKEDIN_BATCH_TAG.sub('', name).strip() if name else "N/A"
+    link = href if href and href.strip() else "N/A"
+    return CompanyRecord(name_text, location_text, description or "N/A", link, "linkedin")
+
+
+class HtmlParser(ABC):
+    """Base class for card extractors."""
+
+    name = ""
+
+    @abstractmethod
+    def parse_yc(self, html: str, base_url: str) -> list[CompanyRecord]:
+        ...
+
+    @abstractmethod
+    def parse_linkedin(self, html: str) -> list[CompanyRecord]:
+        ...
+
+
+class BeautifulSoupParser(HtmlParser):
+    name = "bs4"
+
+    def __init__(self):
+        # Imported here: with selectolax or lxml installed, bs4 is never loaded
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    @staticmethod
+    def _text(tag) -> Optional[str]:
+        return tag.text.strip() if tag else None
+
+    def parse_yc(self, html: str, base_url: str) -> list[CompanyRecord]:
+        soup = self._soup(html, 'html.parser')
+        records = []
+
+        for company in soup.find_all('a', class_=YC_CARD_CLASS):
+            description = company.find('div', class_=YC_DESCRIPTION_CLASS)
+            description = description.find('span') if description else None
+            record = _yc_record(
+                self._text(company.find('span', class_=YC_NAME_CLASS)),
+                self._text(company.find('span', class_=YC_LOCATION_CLASS)),
+                self._text(description),
+                company.get('href'),
+                base_url
+            )
+            if record:
+                records.append(record)
+
+        return records
+
+    def parse_linkedin(self, html: str) -> list[CompanyRecord]:
+        soup = self._soup(html, 'html.parser')
+        records = []
+
+        companies = soup.find('ul', role="list")
+        for company in companies.find_all("li") if companies else []:
+            name = company.find("div", class_=LINKEDIN_NAME_CLASS)
+            if not name:
+                continue
+            name = name.find("a")
+            records.append(_linkedin_record(
+                self._text(name),
+                self._text(company.find('div', class_=LINKEDIN_LOCATION_CLASS)),
+                self._text(company.find('p', class_=LINKEDIN_DESCRIPTION_CLASS)),
+                name.get('href') if name else None
+            ))
+
+        return records
+
+
+class LxmlParser(HtmlParser):
+    name = "lxml"
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("lxml is not installed")
+        self.yc_cards = etree.XPath("//a[contains(@class, '_company')]")
+        self.yc_name = etree.XPath(".//span[contains(@class, 'coName')]")
+        self.yc_location = etree.XPath(".//span[contains(@class, 'coLocation')]")
+        self.yc_description = etree.XPath(".//div[contains(@class, 'text-sm')]")
+        self.span = etree.XPath(".//span")
+        self.linkedin_list = etree.XPath("//ul[@role='list']")
+        self.linkedin_cards = etree.XPath(".//li")
+        self.linkedin_name = etree.XPath(".//div[@class='t-roman t-sans']")
+        self.linkedin_name_link = etree.XPath(".//a")
+        self.linkedin_location = etree.XPath(".//div[contains(@class, 't-14 t-black t-normal')]")
+        self.linkedin_description = etree.XPath(".//p[contains(@class, 'entity-result__summary--2-lines')]")
+
+    @staticmethod
+    def _document(html: str):
+        return lxml.html.document_fromstring(html) if html.strip() else None
+
+    @staticmethod
+    def _first_text(xpath, element) -> Optional[str]:
+        found = xpath(element)
+        return found[0].text_content().strip() if found else None
+
+    def parse_yc(self, html: str, base_url: str) -> list[CompanyRecord]:
+        document = self._document(html)
+        if document is None:
+            return []
+        records = []
+
+        for company in self.yc_cards(document):
+            description = self.yc_description(company)
+            record = _yc_record(
+                self._first_text(self.yc_name, company),
+                self._first_text(self.yc_location, company),
+                self._first_text(self.span, description[0]) if description else None,
+                company.get('href'),
+                base_url
+            )
+            if record:
+                records.append(record)
+
+        return records
+
+    def parse_linkedin(self, html: str) -> list[CompanyRecord]:
+        document = self._document(html)
+        if document is None:
+            return []
+        records = []
+
+        companies = self.linkedin_list(document)
+        for company in self.linkedin_cards(companies[0]) if companies else []:
+            name = self.linkedin_name(company)
+            if not name:
+                continue
+            name = self.linkedin_name_link(name[0])
+            name = name[0] if name else None
+            records.append(_linkedin_record(
+                name.text_content().strip() if name is not None else None,
+                self._first_text(self.linkedin_location, company),
+                self._first_text(self.linkedin_description, company),
+                name.get('href') if name is not None else None
+            ))
+
+        return records
+
+
+class SelectolaxParser(HtmlParser):
+    name = "selectolax"
+
+    def __init__(self):
+        if SelectolaxHTMLParser is None:
+            raise ImportError("selectolax is not installed")
+
+    @staticmethod
+    def _text(node) -> Optional[str]:
+        return node.text(deep=True).strip() if node else None
+
+    def parse_yc(self, html: str, base_url: str) -> list[CompanyRecord]:
+        tree = SelectolaxHTMLParser(html)
+        records = []
+
+        for company in tree.css(YC_CARD_CSS):
+            description = company.css_first(YC_DESCRIPTION_CSS)
+            description = description.css_first('span') if description else None
+            record = _yc_record(
+                self._text(company.css_first(YC_NAME_CSS)),
+                self._text(company.css_first(YC_LOCATION_CSS)),
+                self._text(description),
+                company.attributes.get('href'),
+                base_url
+            )
+            if record:
+                records.append(record)
+
+        return records
+
+    def parse_linkedin(self, html: str) -> list[CompanyRecord]:
+        tree = SelectolaxHTMLParser(html)
+        records = []
+
+        companies = tree.css_first(LINKEDIN_LIST_CSS)
+        for company in companies.css('li') if companies else []:
+            name = company.css_first(LINKEDIN_NAME_CSS)
+            if not name:
+                continue
+            name = name.css_first('a')
+            records.append(_linkedin_record(
+                self._text(name),
+                self._text(company.css_first(LINKEDIN_LOCATION_CSS)),
+                self._text(company.css_first(LINKEDIN_DESCRIPTION_CSS)),
+                name.attributes.get('href') if name else None
+            ))
+
+        return records
+
+
+PARSER_BACKENDS = {
+    SelectolaxParser.name: SelectolaxParser,
+    LxmlParser.name: LxmlParser,
+    BeautifulSoupParser.name: BeautifulSoupParser,
+}
+
+
+def available_backends() -> list[str]:
+    """Names of the installed backends, fastest first."""
+    installed = {
+        SelectolaxParser.name: SelectolaxHTMLParser is not None,
+        LxmlParser.name: lxml is not None,
+        BeautifulSoupParser.name: True,
+    }
+    return [name for name in PARSER_BACKENDS if installed[name]]
+
+
+def get_parser(backend: str = "auto") -> HtmlParser:
+    """Return the requested parser backend, or the fastest installed one for "auto"."""
+    if backend == "auto":
+        backend = available_backends()[0]
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+    return PARSER_BACKENDS[backend]()
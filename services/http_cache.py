@@ -0,0 +1,48 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers that make the server answer 304 if the page is unchanged."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """On-disk cache of response bodies with their ETag and Last-Modified validators, one JSON file per URL.
+
+    Files are written to a temporary name and renamed, so a crash never leaves a half-written entry.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        try:
+            return CachedResponse(**json.loads(self._path(url).read_text()))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+
+    def put(self, response: CachedResponse) -> None:
+        path = self._path(response.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(response._asdict()))
+        os.replace(temporary, path)
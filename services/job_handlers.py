@@ -0,0 +1,66 @@
+"""Job kinds run by `main.py worker` and the handlers that run them."""
+import logging
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from config import CrawlTarget
+from db.dao.job_dao import JobDAO
+from db.models import Job
+from services.company_enricher import CompanyEnricher, EnrichmentTarget
+from services.crawl_scheduler import AdaptiveInterval, crawl_once
+from services.job_worker import Reschedule
+from services.profiling import CycleProfiler
+from services.stream_scraper_service import StreamScraperService
+
+CRAWL = "crawl"
+ENRICH_SCAN = "enrich_scan"
+ENRICH = "enrich"
+
+
+async def schedule_jobs(session_maker: async_sessionmaker[AsyncSession], targets: list[CrawlTarget], enrich_interval: float) -> None:
+    """Create the recurring jobs for the configured crawl targets and the enrichment scan."""
+    async with session_maker() as session:
+        job_dao = JobDAO(session)
+        await job_dao.schedule(CRAWL, {target.key: {"target": target.model_dump()} for target in targets})
+        await job_dao.schedule(ENRICH_SCAN, {ENRICH_SCAN: {}} if enrich_interval else {})
+
+
+class CrawlJobs:
+    """Crawls a target once per job and reschedules it on its adaptive interval."""
+
+    def __init__(self, scraper: StreamScraperService, profiler: Optional[CycleProfiler] = None):
+        self.scraper = scraper
+        self.profiler = profiler
+
+    async def run(self, job: Job) -> Reschedule:
+        target = CrawlTarget(**job.payload["target"])
+        interval = AdaptiveInterval(target.interval, target.max_interval)
+        interval.current = job.payload.get("interval", target.interval)
+
+        new_companies = await crawl_once(self.scraper, target, self.profiler)
+        delay = interval.update(new_companies > 0)
+        logging.info(f"{target.key}: next crawl in {delay:.0f}s")
+        return Reschedule(delay, {**job.payload, "interval": delay})
+
+
+class EnrichmentJobs:
+    """Queues one job per company to enrich, so enrichment is spread over all workers."""
+
+    def __init__(self, enricher: CompanyEnricher, session_maker: async_sessionmaker[AsyncSession], interval: float):
+        self.enricher = enricher
+        self.session_maker = session_maker
+        self.interval = interval
+
+    async def scan(self, job: Job) -> Reschedule:
+        async with self.session_maker() as session:
+            queued = await JobDAO(session).enqueue_pending_enrichment(ENRICH)
+        if queued:
+            logging.info(f"Queued {queued} companies for enrichment")
+        return Reschedule(self.interval, job.payload)
+
+    async def enrich(self, job: Job) -> None:
+        target = EnrichmentTarget(UUID(job.payload["company_id"]), job.payload["link"])
+        if not await self.enricher.enrich([target]):
+            raise RuntimeError(f"fetching {target.link} failed")
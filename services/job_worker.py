@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+from typing import Awaitable, Callable, NamedTuple, Optional
+from uuid import uuid4
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from db.dao.job_dao import JobDAO
+from db.models import Job
+from services.metrics import JOBS_FINISHED, timed_db
+
+
+class Reschedule(NamedTuple):
+    """Returned by a handler to run the job again in `delay` seconds with `payload`."""
+
+    delay: float
+    payload: dict
+
+
+# Returns None when the job is done for good and can be deleted
+JobHandler = Callable[[Job], Awaitable[Optional[Reschedule]]]
+
+
+class JobWorker:
+    """Claims due jobs from the jobs table and runs up to `concurrency` of them at a time.
+
+    Any number of workers, in any number of processes or hosts, can share the table: each job is
+    leased to one worker at a time. Leases are extended every `lease_seconds / 3` while the job runs.
+    If a lease runs out anyway (e.g. the worker hung), the job is cancelled here, because another
+    worker may already have claimed it. Failed jobs are retried with exponential backoff, and
+    parked with their last error after `max_attempts` failures in a row. Database errors while
+    claiming or releasing jobs are logged, and the slot carries on after `poll_interval`.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        handlers: dict[str, JobHandler],
+        concurrency: int = 4,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 1.0,
+        retry_delay: float = 3.0,
+        max_retry_delay: float = 600.0,
+        max_attempts: int = 10,
+        worker_id: Optional[str] = None
+    ):
+        self.session_maker = session_maker
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+        self._running: dict[int, asyncio.Task] = {}
+        self._lost: set[int] = set()
+
+    async def _claim(self) -> Optional[Job]:
+        with timed_db("job_claim"):
+            async with self.session_maker() as session:
+                jobs = await JobDAO(session).claim(self.worker_id, self.handlers, 1, self.lease_seconds)
+        return jobs[0] if jobs else None
+
+    async def _finish(self, job: Job, result: Optional[Reschedule]) -> bool:
+        async with self.session_maker() as session:
+            job_dao = JobDAO(session)
+            if result is None:
+                return await job_dao.delete(job.id, self.worker_id)
+            return await job_dao.release(job.id, self.worker_id, result.delay, result.payload, attempts=0, last_error=None)
+
+    async def _fail(self, job: Job, error: Exception) -> None:
+        if job.attempts >= self.max_attempts:
+            logging.error(f"Job {job.key} failed (attempt {job.attempts}), parking it: {error}")
+            async with self.session_maker() as session:
+                await JobDAO(session).release(job.id, self.worker_id, 0, job.payload, last_error=str(error), parked_at=func.now())
+            JOBS_FINISHED.labels(job.kind, "parked").inc()
+            return
+
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** (job.attempts - 1))
+        logging.error(f"Job {job.key} failed (attempt {job.attempts}), retrying in {delay:.0f}s: {error}")
+        async with self.session_maker() as session:
+            await JobDAO(session).release(job.id, self.worker_id, delay, job.payload, last_error=str(error))
+
+    async def _run_job(self, job: Job) -> None:
+        task = asyncio.create_task(self.handlers[job.kind](job))
+        self._running[job.id] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if job.id not in self._lost:
+                # Shutting down: hand the job back instead of waiting for the lease to expire
+                async with self.session_maker() as session:
+                    await JobDAO(session).release(job.id, self.worker_id, 0, job.payload)
+                raise
+            self._lost.discard(job.id)
+            JOBS_FINISHED.labels(job.kind, "lease_lost").inc()
+            logging.warning(f"Job {job.key}: lease lost, cancelled")
+        except Exception as e:
+            JOBS_FINISHED.labels(job.kind, "error").inc()
+            await self._fail(job, e)
+        else:
+            if not await self._finish(job, result):
+                logging.warning(f"Job {job.key}: lease lost before the result was saved")
+            JOBS_FINISHED.labels(job.kind, "done").inc()
+        finally:
+            del self._running[job.id]
+
+    async def _slot(self, until_idle: bool) -> None:
+        while True:
+            try:
+                job = await self._claim()
+                if job is not None:
+                    await self._run_job(job)
+                    continue
+            except Exception as e:
+                # The job, if any, becomes due again when its lease runs out
+                logging.error(f"Job worker slot error: {e}")
+            else:
+                if until_idle:
+                    return
+            # Jitter keeps idle workers from polling in lockstep
+            await asyncio.sleep(self.poll_interval * random.uniform(0.5, 1.5))
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            job_ids = list(self._running)
+            if not job_ids:
+                continue
+            try:
+                async with self.session_maker() as session:
+                    held = await JobDAO(session).heartbeat(self.worker_id, job_ids, self.lease_seconds)
+            except Exception as e:
+                logging.error(f"Job heartbeat failed: {e}")
+                continue
+            for job_id in set(job_ids) - held:
+                task = self._running.get(job_id)
+                if task is not None:
+                    self._lost.add(job_id)
+                    task.cancel()
+
+    async def run(self, until_idle: bool = False) -> None:
+        """Run jobs until cancelled, or with `until_idle` until no job is due."""
+        logging.info(f"Worker {self.worker_id}: kinds={sorted(self.handlers)}; concurrency={self.concurrency}")
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            await asyncio.gather(*(self._slot(until_idle) for _ in range(self.concurrency)))
+        finally:
+            heartbeat.cancel()
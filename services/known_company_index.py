@@ -0,0 +1,45 @@
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+
+
+class KnownCompanyIndex:
+    """Bounded LRU map of stored company cards to the content hash last written for them.
+
+    Keys are (source, name) pairs. A hit means the card is stored with exactly this content and
+    the DB can be skipped. A miss only means the card is not cached or has changed, so the caller
+    falls back to the database, which stays the source of truth.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._hashes: OrderedDict[Hashable, Optional[str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._hashes
+
+    def is_current(self, key: Hashable, content_hash: str) -> bool:
+        """Whether `key` is stored with `content_hash`; counts a hit or a miss."""
+        if self._hashes.get(key) == content_hash:
+            self._hashes.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, key: Hashable, content_hash: Optional[str] = None) -> None:
+        self._hashes[key] = content_hash
+        self._hashes.move_to_end(key)
+        if len(self._hashes) > self.max_size:
+            self._hashes.popitem(last=False)
+
+    def update(self, items: Iterable[tuple[Hashable, Optional[str]]]) -> None:
+        for key, content_hash in items:
+            self.add(key, content_hash)
+
+    def stats(self) -> dict:
+        return {"size": len(self._hashes), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from services.metrics import EVENT_LOOP_LAG_SECONDS
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a task that sleeps for a fixed interval."""
+
+    def __init__(self, interval: float = 0.1, window: int = 600):
+        self.interval = interval
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def stats(self) -> dict:
+        """Lag percentiles in milliseconds over the last `window` samples."""
+        if not self.samples:
+            return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(self.samples)
+        return {
+            "p50": ordered[len(ordered) // 2] * 1000,
+            "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+            "max": ordered[-1] * 1000,
+        }
+
+    async def sample(self) -> None:
+        """Sleep one interval and record how late the loop resumed."""
+        start = time.perf_counter()
+        await asyncio.sleep(self.interval)
+        lag = max(0.0, time.perf_counter() - start - self.interval)
+        self.samples.append(lag)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+
+    async def run(self, report_every: float = 60.0) -> None:
+        """Sample forever, logging lag percentiles every `report_every` seconds."""
+        last_report = time.perf_counter()
+        while True:
+            await self.sample()
+            if time.perf_counter() - last_report >= report_every:
+                stats = self.stats()
+                logging.info(f"Event loop lag: p50={stats['p50']:.1f}ms; p99={stats['p99']:.1f}ms; max={stats['max']:.1f}ms")
+                last_report = time.perf_counter()
@@ -0,0 +1,88 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+
+from services.known_company_index import KnownCompanyIndex
+
+# Browser stages take seconds, parse and DB stages milliseconds; the buckets cover both
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_SECONDS = Histogram(
+    "scraper_stage_seconds",
+    "Time spent in each stage of a crawl cycle",
+    ["source", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+DB_OPERATION_SECONDS = Histogram(
+    "db_operation_seconds",
+    "Time spent in CompanyService database operations",
+    ["operation"],
+    buckets=STAGE_BUCKETS,
+)
+CRAWL_CYCLES = Counter("scraper_cycles_total", "Finished crawl cycles", ["source", "result"])
+CARDS_PARSED = Counter("scraper_cards_parsed_total", "Company cards extracted by the parsers", ["source"])
+COMPANIES_SAVED = Counter(
+    "scraper_companies_saved_total",
+    "New companies saved, or queued for the write-behind writer",
+    ["source"],
+)
+COMPANIES_UPDATED = Counter("companies_updated_total", "Stored companies rewritten because their content changed")
+JOBS_FINISHED = Counter("jobs_finished_total", "Jobs run by this worker, by result: done, error, parked (after its last error) or lease_lost", ["kind", "result"])
+ENRICHMENT_RESPONSES = Counter(
+    "enrichment_responses_total",
+    "Company detail page requests by result: fetched, not_modified, gone or error",
+    ["result"],
+)
+WRITER_BATCH_SECONDS = Histogram(
+    "company_writer_batch_seconds",
+    "Latency of one write-behind batch",
+    buckets=STAGE_BUCKETS,
+)
+WRITER_QUEUE_DEPTH = Gauge("company_writer_queue_depth", "Records waiting in the write-behind queue")
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop resumed a sleeping task",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+
+@contextmanager
+def timed(source: str, stage: str) -> Iterator[None]:
+    """Observe the duration of the block in scraper_stage_seconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(source, stage).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def timed_db(operation: str) -> Iterator[None]:
+    """Observe the duration of the block in db_operation_seconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        DB_OPERATION_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+
+class KnownIndexCollector:
+    """Exports the known-company index counters at scrape time."""
+
+    def __init__(self, known_index: KnownCompanyIndex):
+        self.known_index = known_index
+
+    def collect(self):
+        yield CounterMetricFamily("known_company_index_hits", "Cards found unchanged in the index", value=self.known_index.hits)
+        yield CounterMetricFamily("known_company_index_misses", "Cards not in the index or changed", value=self.known_index.misses)
+        yield GaugeMetricFamily("known_company_index_size", "Cards held in the index", value=len(self.known_index))
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", known_index: KnownCompanyIndex = None) -> None:
+    """Serve all metrics in Prometheus text format on http://host:port/metrics."""
+    start_http_server(port, addr=host)
+    if known_index is not None:
+        REGISTRY.register(KnownIndexCollector(known_index))
@@ -0,0 +1,53 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from services.html_parsers import HtmlParser, get_parser
+from services.records import CompanyRecord
+
+# One parser per worker process, created on first use
+_worker_parsers: dict[str, HtmlParser] = {}
+
+
+def _worker_parser(backend: str) -> HtmlParser:
+    parser = _worker_parsers.get(backend)
+    if parser is None:
+        parser = _worker_parsers[backend] = get_parser(backend)
+    return parser
+
+
+def _parse_yc(backend: str, html: str, base_url: str) -> list[CompanyRecord]:
+    return _worker_parser(backend).parse_yc(html, base_url)
+
+
+def _parse_linkedin(backend: str, html: str) -> list[CompanyRecord]:
+    return _worker_parser(backend).parse_linkedin(html)
+
+
+class ParseExecutor:
+    """Runs HTML parsing inline or in a process pool, so large pages don't block the event loop."""
+
+    def __init__(self, backend: str = "auto", workers: int = 0):
+        self.parser = get_parser(backend)
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            # spawn: forking a process that already runs Playwright and asyncpg threads is unsafe
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def _run(self, func, *args) -> list[CompanyRecord]:
+        if self._pool is None:
+            return func(self.parser.name, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, self.parser.name, *args)
+
+    async def parse_yc(self, html: str, base_url: str) -> list[CompanyRecord]:
+        return await self._run(_parse_yc, html, base_url)
+
+    async def parse_linkedin(self, html: str) -> list[CompanyRecord]:
+        return await self._run(_parse_linkedin, html)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,70 @@
+import cProfile
+import logging
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:
+    PyinstrumentProfiler = None
+
+
+class CycleProfiler:
+    """Profiles selected crawl cycles and writes one report per cycle into `output_dir`.
+
+    A cycle is profiled when `toggle_file` exists at its start (the file is removed, so creating it
+    profiles exactly one cycle), or on every `every_n_cycles`-th cycle when that is above zero.
+    pyinstrument is used if installed (HTML report), otherwise cProfile (.prof for pstats/snakeviz).
+    Only one cycle is profiled at a time.
+    """
+
+    def __init__(self, output_dir: str, every_n_cycles: int = 0, toggle_file: Optional[str] = None):
+        self.output_dir = Path(output_dir)
+        self.every_n_cycles = every_n_cycles
+        self.toggle_file = Path(toggle_file) if toggle_file else None
+        self.cycles = 0
+        self._active = False
+
+    def _should_profile(self) -> bool:
+        self.cycles += 1
+        if self._active:
+            return False
+        if self.toggle_file is not None and self.toggle_file.exists():
+            self.toggle_file.unlink(missing_ok=True)
+            return True
+        return self.every_n_cycles > 0 and self.cycles % self.every_n_cycles == 0
+
+    @asynccontextmanager
+    async def profile(self, name: str) -> AsyncIterator[None]:
+        if not self._should_profile():
+            yield
+            return
+
+        self._active = True
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.output_dir / f"{name.replace(':', '_').replace(' ', '_')}-{time.strftime('%Y%m%d-%H%M%S')}"
+        try:
+            if PyinstrumentProfiler is not None:
+                profiler = PyinstrumentProfiler(async_mode="enabled")
+                profiler.start()
+                try:
+                    yield
+                finally:
+                    profiler.stop()
+                    path = stem.with_suffix(".html")
+                    path.write_text(profiler.output_html())
+            else:
+                # cProfile sees every coroutine on the loop while this cycle runs, not just this one
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    yield
+                finally:
+                    profiler.disable()
+                    path = stem.with_suffix(".prof")
+                    profiler.dump_stats(path)
+            logging.info(f"Profile of {name} written to {path}")
+        finally:
+            self._active = False
@@ -0,0 +1,21 @@
+import hashlib
+from typing import NamedTuple
+
+
+def content_hash(location: str, description: str, link: str) -> str:
+    """md5 over the fields that can change for a company, as stored in `content_hash` columns."""
+    return hashlib.md5("\x1f".join((location, description, link)).encode()).hexdigest()
+
+
+class CompanyRecord(NamedTuple):
+    """Plain company card fields as extracted by the parsers."""
+
+    name: str
+    location: str
+    description: str
+    link: str
+    source: str
+
+    @property
+    def content_hash(self) -> str:
+        return content_hash(self.location, self.description, self.link)
@@ -0,0 +1,66 @@
+"""Helpers for load testing the crawler against recorded HAR sessions instead of the live sites."""
+import json
+
+from services.html_parsers import LINKEDIN_LIST_CSS, LINKEDIN_NAME_CSS, YC_CARD_CSS, YC_NAME_CSS
+
+COPY_MARKER = "data-replay-copy"
+
+# Runs before the page's own scripts. Every card the site renders is followed by `copies` clones
+# whose names and links carry a " <k>" / "-<k>" suffix, so each one is a distinct company downstream.
+DUPLICATE_CARDS_JS = """
+(() => {
+    const CARDS = %(cards)s;
+    const COPIES = %(copies)d;
+    const MARKER = %(marker)s;
+
+    const renameText = (element, k) => {
+        const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            if (node.textContent.trim()) {
+                // Before a LinkedIn "(YC S25)" batch tag, which the parser strips
+                node.textContent = node.textContent.replace(/^(\\s*\\S.*?)(\\s*\\(YC [A-Z]+\\d{2}\\))?(\\s*)$/s, `$1 ${k}$2$3`);
+                return;
+            }
+        }
+    };
+    const renameLink = (link, k) => {
+        const href = link.getAttribute("href");
+        if (href) {
+            link.setAttribute("href", href.replace(/(\\/[^\\/?#]+)(\\/?)(?=[?#]|$)/, `$1-${k}$2`));
+        }
+    };
+    const expand = (card, nameSelector) => {
+        if (card.hasAttribute(MARKER)) {
+            return;
+        }
+        card.setAttribute(MARKER, "0");
+        let last = card;
+        for (let k = 1; k <= COPIES; k++) {
+            const copy = card.cloneNode(true);
+            copy.setAttribute(MARKER, String(k));
+            const name = copy.querySelector(nameSelector);
+            if (name) {
+                renameText(name, k);
+            }
+            for (const link of [copy, ...copy.querySelectorAll("a[href]")]) {
+                if (link.hasAttribute("href")) {
+                    renameLink(link, k);
+                }
+            }
+            last.after(copy);
+            last = copy;
+        }
+    };
+    new MutationObserver(() => {
+        for (const [cardSelector, nameSelector] of CARDS) {
+            document.querySelectorAll(cardSelector).forEach((card) => expand(card, nameSelector));
+        }
+    }).observe(document, {childList: true, subtree: true});
+})();
+"""
+
+
+def duplicate_cards_script(copies: int) -> str:
+    """Init script that makes every YC and LinkedIn card appear `copies` more times."""
+    cards = [[YC_CARD_CSS, YC_NAME_CSS], [f"{LINKEDIN_LIST_CSS} > li", f"{LINKEDIN_NAME_CSS} a"]]
+    return DUPLICATE_CARDS_JS % {"cards": json.dumps(cards), "copies": copies, "marker": json.dumps(COPY_MARKER)}
@@ -1,203 +1,497 @@
 import asyncio
 import logging
-import re
-from playwright.async_api import async_playwright, Page
-from bs4 import BeautifulSoup
+from typing import NamedTuple, Optional
+from urllib.parse import quote, urlencode
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
+from config import CrawlTarget
+from services.browser_pool import BrowserPool
 from services.company_service import CompanyService
+from services.company_writer import CompanyWriter, OnWritten
+from services.crawl_checkpoints import Checkpoint, CheckpointStore
+from services.html_parsers import LINKEDIN_LIST_CSS, YC_CARD_CSS
+from services.metrics import CARDS_PARSED, COMPANIES_SAVED, timed
+from services.parse_executor import ParseExecutor
+from services.rate_limiter import HostRateLimiter
+from services.records import CompanyRecord
+
+# In-page collectors for incremental extraction. Every card that has been serialized once is
+# tagged with a marker attribute, so each call returns only the cards added since the last one.
+# Along with the HTML they return the card count and the last card's link from the same moment,
+# so a checkpoint built from them covers exactly the cards handed to the parser. The Y Combinator
+# collector also returns each fresh card's link with an FNV-1a hash of its link and text.
+CARD_MARKER = "data-scraped"
+
+YC_NEW_CARDS_JS = """
+([selector, marker]) => {
+    const cards = document.querySelectorAll(selector);
+    const fresh = [];
+    const signatures = [];
+    for (const node of cards) {
+        if (node.hasAttribute(marker)) continue;
+        node.setAttribute(marker, "");
+        fresh.push(node.outerHTML);
+        const link = node.getAttribute("href") || node.querySelector("a[href]")?.getAttribute("href") || "";
+        const text = link + "\u0000" + node.textContent;
+        let hash = 0x811c9dc5;
+        for (let i = 0; i < text.length; i++) {
+            hash ^= text.charCodeAt(i);
+            hash = Math.imul(hash, 0x01000193);
+        }
+        signatures.push([link, (hash >>> 0).toString(16)]);
+    }
+    const last = cards[cards.length - 1];
+    return {
+        html: fresh.join(""),
+        count: cards.length,
+        last: last ? (last.getAttribute("href") || last.querySelector("a[href]")?.getAttribute("href") || null) : null,
+        signatures,
+    };
+}
+"""
+
+LINKEDIN_NEW_CARDS_JS = """
+([selector, marker]) => {
+    const cards = document.querySelectorAll(selector);
+    const fresh = [];
+    for (const node of cards) {
+        if (node.hasAttribute(marker)) continue;
+        node.setAttribute(marker, "");
+        fresh.push(node.outerHTML);
+    }
+    const last = cards[cards.length - 1];
+    return {
+        html: fresh.length ? `<ul role="list">${fresh.join("")}</ul>` : "",
+        count: cards.length,
+        last: last ? (last.getAttribute("href") || last.querySelector("a[href]")?.getAttribute("href") || null) : null,
+    };
+}
+"""
+
+# Cheap in-page signature of a card list: card count plus an FNV-1a hash of every card's link and text.
+# Equal signatures mean the parsers would extract exactly the same records.
+LIST_SIGNATURE_JS = """
+(selector) => {
+    let hash = 0x811c9dc5;
+    const cards = document.querySelectorAll(selector);
+    for (const card of cards) {
+        const link = card.getAttribute("href") || card.querySelector("a[href]")?.getAttribute("href") || "";
+        const text = link + "\u0000" + card.textContent;
+        for (let i = 0; i < text.length; i++) {
+            hash ^= text.charCodeAt(i);
+            hash = Math.imul(hash, 0x01000193);
+        }
+    }
+    return `${cards.length}:${(hash >>> 0).toString(16)}`;
+}
+"""
+
+LIST_CHANGED_JS = f"([selector, previous]) => ({LIST_SIGNATURE_JS})(selector) !== previous"
+
+CARD_COUNT_JS = "(selector) => document.querySelectorAll(selector).length"
+
+CARD_COUNT_GROWN_JS = "([selector, count]) => document.querySelectorAll(selector).length > count"
+
+# Tags the first `count` cards as already serialized, so a resumed cycle skips the cards saved before.
+# Only if the card at that depth is still `last`; otherwise the list has shifted, nothing is tagged
+# and false is returned.
+MARK_SEEN_JS = """
+([selector, marker, count, last]) => {
+    const nodes = document.querySelectorAll(selector);
+    const card = nodes[count - 1];
+    const link = card ? (card.getAttribute("href") || card.querySelector("a[href]")?.getAttribute("href") || null) : null;
+    if (last !== null && link !== last) return false;
+    for (let i = 0; i < Math.min(count, nodes.length); i++) nodes[i].setAttribute(marker, "");
+    return true;
+}
+"""
+
+# Drops the markers from every card. LinkedIn may reuse the list nodes for the next result page,
+# and a reused node must not be taken for a card that was already serialized.
+CLEAR_MARKERS_JS = """
+([selector, marker]) => {
+    for (const node of document.querySelectorAll(selector)) node.removeAttribute(marker);
+}
+"""
+
+CARD_POSITION_JS = """
+(selector) => {
+    const cards = document.querySelectorAll(selector);
+    const last = cards[cards.length - 1];
+    return {
+        count: cards.length,
+        last: last ? (last.getAttribute("href") || last.querySelector("a[href]")?.getAttribute("href") || null) : null,
+    };
+}
+"""
+
+LINKEDIN_CARD_CSS = f"{LINKEDIN_LIST_CSS} > li"
+
+
+class CollectedCards(NamedTuple):
+    """HTML to parse, with the number of cards on the page and the last card's link when it was taken.
+
+    `signatures` pairs each collected card's link with a hash of its content, when the collector provides them.
+    """
+
+    html: str
+    count: int
+    last: Optional[str]
+    signatures: tuple[tuple[str, str], ...] = ()
 
 
 class StreamScraperService:
-    def __init__(self, company_service: CompanyService, linkedin_cookies: list):
-        self.user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+    def __init__(
+        self,
+        company_service: CompanyService,
+        linkedin_cookies: list,
+        incremental: bool = True,
+        parse_executor: Optional[ParseExecutor] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        writer: Optional[CompanyWriter] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        scroll_timeout_ms: int = 5000
+    ):
         self.BASE_URL = "https://www.ycombinator.com"
-        self.url = "https://www.ycombinator.com/companies?batch=Spring%202025"
-        self.linkedin_url = "https://linkedin.com/search/results/companies/?keywords=YC%20S25&origin=CLUSTER_EXPANSION&sid=AoG"
+        self.linkedin_search_base_url = "https://linkedin.com/search/results/companies/"
         self.company_service = company_service
         self.linkedin_cookies = linkedin_cookies
+        self.incremental = incremental
+        self.parse_executor = parse_executor or ParseExecutor()
+        self.browser_pool = browser_pool or BrowserPool()
+        self.writer = writer
+        self.rate_limiter = rate_limiter
+        self.checkpoints = checkpoints
+        self.scroll_timeout_ms = scroll_timeout_ms
+        # Card list signature from the last parse whose records were all written, by target key (and page or scroll step)
+        self._signatures: dict[str, str] = {}
+        # Targets whose current cycle lost a write; their checkpoints stay before the lost page
+        self._failed_writes: set[str] = set()
 
-    async def parse_page(self, html: str) -> int:
-        """Parse HTML and save new companies to the database. Return count of new companies."""
-        soup = BeautifulSoup(html, 'html.parser')
-        new_company_count = 0
+    def ycombinator_url(self, batch: str) -> str:
+        return f"{self.BASE_URL}/companies?{urlencode({'batch': batch}, quote_via=quote)}"
+
+    def linkedin_search_url(self, keywords: str, page_number: int = 1) -> str:
+        params = {"keywords": keywords, "origin": "CLUSTER_EXPANSION"}
+        if page_number > 1:
+            params["page"] = page_number
+        return f"{self.linkedin_search_base_url}?{urlencode(params, quote_via=quote)}"
+
+    async def _throttle(self, url: str) -> None:
+        """Wait for the per-host rate limit before a navigation."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(url)
+
+    async def _collect_cards(self, page: Page, collector_js: str, selector: str, source: str) -> CollectedCards:
+        """Return the HTML to parse: only unseen cards in incremental mode, otherwise the whole page."""
+        with timed(source, "page_content"):
+            if not self.incremental:
+                html = await page.content()
+                return CollectedCards(html, **await page.evaluate(CARD_POSITION_JS, selector))
+            cards = await page.evaluate(collector_js, [selector, CARD_MARKER])
+            cards["signatures"] = tuple(map(tuple, cards.get("signatures", ())))
+            return CollectedCards(**cards)
+
+    async def _save(self, records: list[CompanyRecord], source: str, on_written: Optional[OnWritten] = None) -> int:
+        """Save parsed records. Return new companies, or records queued when a write-behind writer is set.
+
+        `on_written` is awaited once the records are in the database, or failed to get there.
+        """
+        with timed(source, "db_write"):
+            if self.writer is not None:
+                saved = await self.writer.put_many(records, on_written)
+            else:
+                # Save the whole page in one statement; only new companies come back
+                saved = len(await self.company_service.upsert_many(records))
+                if on_written is not None:
+                    await on_written(True)
+
+        COMPANIES_SAVED.labels(source).inc(saved)
+        return saved
+
+    async def _start_cycle(self, target_key: str) -> Checkpoint:
+        if self.checkpoints is None:
+            return Checkpoint.new_cycle(target_key)
+        return await self.checkpoints.start_cycle(target_key)
 
-        # Find company cards
-        companies = soup.find_all('a', class_=re.compile(r'.*_company.*'))
-        if not companies:
+    async def _after_writes(self, on_written: OnWritten) -> None:
+        """Await `on_written` once everything saved so far has been written."""
+        if self.writer is not None:
+            await self.writer.put_many([], on_written)
+        else:
+            await on_written(True)
+
+    @staticmethod
+    def _next_checkpoint(checkpoint: Checkpoint, cards: CollectedCards, page_number: int) -> Checkpoint:
+        """The checkpoint to store once `page_number`, collected as `cards`, has been written."""
+        return checkpoint._replace(page_number=page_number, card_count=cards.count, last_card=cards.last)
+
+    def _page_written(self, checkpoint: Optional[Checkpoint], signatures: Optional[dict[str, str]] = None) -> OnWritten:
+        """Callback for when a page's records are written: remember its signatures and store its checkpoint.
+
+        After a failed write the page keeps no signatures, so the next cycle parses it again, and the
+        target's checkpoint is not advanced any further this cycle.
+        """
+        async def written(ok: bool) -> None:
+            if not ok:
+                for signature_key in signatures or ():
+                    self._signatures.pop(signature_key, None)
+                if checkpoint is not None:
+                    self._failed_writes.add(checkpoint.target_key)
+                return
+            if signatures:
+                self._signatures.update(signatures)
+            if self.checkpoints is not None and checkpoint is not None and checkpoint.target_key not in self._failed_writes:
+                await self.checkpoints.save(checkpoint)
+        return written
+
+    async def _complete_cycle(self, checkpoint: Checkpoint) -> None:
+        """Once the cycle's records are written, mark it finished, so the next one starts from the first page."""
+        completed = asyncio.get_running_loop().create_future()
+
+        async def complete(_ok: bool) -> None:
+            try:
+                self._failed_writes.discard(checkpoint.target_key)
+                if self.checkpoints is not None:
+                    await self.checkpoints.save(checkpoint._replace(completed=True))
+            finally:
+                completed.set_result(None)
+
+        await self._after_writes(complete)
+        await completed
+
+    def _log_known_index_stats(self, source: str) -> None:
+        known_index = self.company_service.known_index
+        if known_index is not None:
+            stats = known_index.stats()
+            logging.info(f"{source} known-company index: size={stats['size']}; hits={stats['hits']}; misses={stats['misses']}")
+
+    async def parse_page(self, html: str, on_written: Optional[OnWritten] = None) -> int:
+        """Parse HTML and save new companies to the database. Return count of new companies."""
+        with timed("ycombinator", "parse"):
+            records = await self.parse_executor.parse_yc(html, self.BASE_URL)
+        CARDS_PARSED.labels("ycombinator").inc(len(records))
+        if not records:
             logging.warning("No company cards found on Y Combinator page")
 
-        # Extract and save data from each company card
-        for company in companies:
-            name = company.find('span', class_=re.compile(r'.*coName.*'))
-            location = company.find('span', class_=re.compile(r'.*coLocation.*'))
-            description = company.find('div', class_=re.compile(r'.*text-sm.*'))
-            description = description.find('span') if description else None
-
-            name_text = name.text.strip() if name and name.text.strip() else None
-            if not name_text:  # Skip if name is missing
-                continue
-            location_text = location.text.strip() if location and location.text.strip() else "N/A"
-            desc_text = description.text.strip() if description and description.text.strip() else "N/A"
-            href = company.get('href')
-            link = f"{self.BASE_URL}{href}" if href and href.strip() else "N/A"
-
-            # Check and save new company to database
-            existing_company = await self.company_service.get_by_name(name_text)
-            if not existing_company:
-                await self.company_service.create_new(
-                    name=name_text,
-                    location=location_text,
-                    description=desc_text,
-                    link=link
-                )
-                new_company_count += 1
+        return await self._save(records, "ycombinator", on_written)
 
-        return new_company_count
+    async def _scroll_for_more(self, page: Page, card_count: int) -> bool:
+        """Scroll to the bottom and wait for more than `card_count` cards. Return False once none come."""
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try:
+            with timed("ycombinator", "scroll_step"):
+                await page.wait_for_function(CARD_COUNT_GROWN_JS, arg=[YC_CARD_CSS, card_count], timeout=self.scroll_timeout_ms)
+        except PlaywrightTimeoutError:
+            return False
+        return True
 
-    async def scroll_and_parse(self, page: Page) -> int:
-        """Parse visible content, scroll, and save new companies. Return total new companies."""
-        total_new_companies = 0
+    async def _parse_step(self, cards: CollectedCards, key: str, step: int, checkpoint: Checkpoint) -> int:
+        """Parse and save the cards one scroll step loaded, unless every one is the same as last cycle.
 
-        # Parse initial content
-        html = await page.content()
-        new_companies = await self.parse_page(html)
-        total_new_companies += new_companies
-        logging.info(f"Y Combinator initial parse: found {new_companies} new companies")
+        Signatures are kept per card link, so how the cards split into steps does not matter.
+        """
+        signatures = {f"{key}@{link}": signature for link, signature in cards.signatures if link}
+        unchanged = len(signatures) == len(cards.signatures) and all(
+            self._signatures.get(card_key) == signature for card_key, signature in signatures.items()
+        )
+        if signatures and unchanged:
+            logging.info(f"Y Combinator [{key}]: {len(signatures)} cards in scroll step {step} unchanged, skipping parse")
+            await self._after_writes(self._page_written(checkpoint))
+            return 0
+        return await self.parse_page(cards.html, self._page_written(checkpoint, signatures))
 
-        # Scroll until no new content is loaded
-        last_height = await page.evaluate("document.body.scrollHeight")
-        while True:
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(1)
-            new_height = await page.evaluate("document.body.scrollHeight")
+    async def scroll_and_parse(
+        self,
+        page: Page,
+        key: str = "ycombinator",
+        checkpoint: Optional[Checkpoint] = None,
+        stop_at_known: bool = False,
+        max_pages: Optional[int] = None
+    ) -> int:
+        """Scroll through the directory, parsing and saving the cards each scroll step loads.
 
-            html = await page.content()
-            new_companies = await self.parse_page(html)
-            total_new_companies += new_companies
-            logging.info(f"Y Combinator scroll: added {new_companies} new companies")
+        Steps whose cards are unchanged since the last cycle are not parsed again. When resuming
+        from `checkpoint`, the list is first scrolled to the checkpointed depth and the cards up to
+        it are skipped, unless the card there is no longer the checkpoint's last card. With `stop_at_known`, scrolling stops at the first step without new companies,
+        and with `max_pages`, after that many steps. Return total new companies.
+        """
+        if not self.incremental:
+            return await self._scroll_and_parse_whole(page, key, max_pages)
 
-            if new_height == last_height:
-                logging.info("Y Combinator scrolling complete: no new data loaded")
+        checkpoint = checkpoint or Checkpoint.new_cycle(key)
+        if checkpoint.card_count:
+            card_count = await page.evaluate(CARD_COUNT_JS, YC_CARD_CSS)
+            while card_count < checkpoint.card_count and await self._scroll_for_more(page, card_count):
+                card_count = await page.evaluate(CARD_COUNT_JS, YC_CARD_CSS)
+            seen = [YC_CARD_CSS, CARD_MARKER, checkpoint.card_count, checkpoint.last_card]
+            if not await page.evaluate(MARK_SEEN_JS, seen):
+                logging.warning(f"Y Combinator [{key}]: card list shifted since the checkpoint, parsing it from the top")
+
+        total_new_companies = 0
+        step = checkpoint.page_number
+        while True:
+            cards = await self._collect_cards(page, YC_NEW_CARDS_JS, YC_CARD_CSS, "ycombinator")
+            if cards.html:
+                step += 1
+                checkpoint = self._next_checkpoint(checkpoint, cards, step)
+                new_companies = await self._parse_step(cards, key, step, checkpoint)
+                total_new_companies += new_companies
+                if stop_at_known and new_companies == 0:
+                    logging.info(f"Y Combinator [{key}]: no new companies in scroll step {step}, stopping early")
+                    break
+                if max_pages is not None and step >= max_pages:
+                    logging.info(f"Y Combinator [{key}]: reached {max_pages} scroll steps, stopping")
+                    break
+
+            # Cards added after the collector ran count as growth, so the next step picks them up
+            if not await self._scroll_for_more(page, cards.count):
+                logging.info(f"Y Combinator scrolling complete: {cards.count} cards loaded")
                 break
-            last_height = new_height
 
+        await self._complete_cycle(checkpoint)
         return total_new_companies
 
-    async def parse_ycombinator_site(self) -> None:
-        """Scrape Y Combinator website with real-time updates."""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page(user_agent=self.user_agent)
+    async def _scroll_and_parse_whole(self, page: Page, key: str, max_pages: Optional[int] = None) -> int:
+        """Scroll to the end or `max_pages` deep, then parse and save the whole page if the list changed since the last cycle."""
+        card_count = await page.evaluate(CARD_COUNT_JS, YC_CARD_CSS)
+        pages = 1
+        while (max_pages is None or pages < max_pages) and await self._scroll_for_more(page, card_count):
+            card_count = await page.evaluate(CARD_COUNT_JS, YC_CARD_CSS)
+            pages += 1
+        logging.info(f"Y Combinator scrolling complete: {card_count} cards loaded")
 
-            try:
-                while True:
-                    try:
-                        await page.goto(self.url, wait_until="networkidle", timeout=30000)
-                        new_companies = await self.scroll_and_parse(page)
-                        logging.info(f"Y Combinator total new companies: {new_companies}")
-                        await asyncio.sleep(30)
-                    except Exception as e:
-                        logging.error(f"Y Combinator error: {e}")
-                        await asyncio.sleep(3)
-            except KeyboardInterrupt:
-                logging.info("Y Combinator scraping stopped by user")
-            finally:
-                await browser.close()
+        signature = await page.evaluate(LIST_SIGNATURE_JS, YC_CARD_CSS)
+        if self._signatures.get(key) == signature:
+            logging.info(f"Y Combinator [{key}]: card list unchanged, skipping parse")
+            return 0
 
-    async def parse_page_linkedin(self, html: str) -> int:
-        """Parse LinkedIn HTML and save new companies. Return count of new companies."""
-        soup = BeautifulSoup(html, 'html.parser')
-        new_company_count = 0
+        cards = await self._collect_cards(page, YC_NEW_CARDS_JS, YC_CARD_CSS, "ycombinator")
+        return await self.parse_page(cards.html, self._page_written(None, {key: signature}))
 
-        # Find company cards
-        companies = soup.find('ul', role="list")
-        companies = companies.find_all("li") if companies else []
-        if not companies:
+    async def parse_ycombinator_site(self, target: CrawlTarget) -> int:
+        """Crawl one Y Combinator batch once, resuming an interrupted cycle. Return total new companies."""
+        checkpoint = await self._start_cycle(target.key)
+        url = self.ycombinator_url(target.query)
+        async with self.browser_pool.page(target.key) as page:
+            await self._throttle(url)
+            with timed("ycombinator", "goto"):
+                await page.goto(url, wait_until="networkidle", timeout=30000)
+            new_companies = await self.scroll_and_parse(
+                page, target.key, checkpoint, target.stop_at_known_page, target.max_pages
+            )
+
+        logging.info(f"Y Combinator [{target.query}] total new companies: {new_companies}")
+        self._log_known_index_stats("Y Combinator")
+        return new_companies
+
+    async def parse_page_linkedin(self, html: str, on_written: Optional[OnWritten] = None) -> int:
+        """Parse LinkedIn HTML and save new companies. Return count of new companies."""
+        with timed("linkedin", "parse"):
+            records = await self.parse_executor.parse_linkedin(html)
+        CARDS_PARSED.labels("linkedin").inc(len(records))
+        if not records:
             logging.warning("No company cards found on LinkedIn page")
 
-        # Extract and save data from each company card
-        for company in companies:
-            name = company.find("div", class_="t-roman t-sans") or None
-            if not name:
-                continue
-            name = name.find("a")
-            location = company.find('div', class_=re.compile(r'.*t-14 t-black t-normal.*'))
-            description = company.find('p', class_=re.compile(r'.*entity-result__summary--2-lines.*'))
-
-            location_pattern = r'•\s*([^\n<]+?)(?=<|$)'
-            location_text = None
-            if location and location.text.strip():
-                match = re.search(location_pattern, location.text.strip())
-                location_text = match.group(1).strip() if match else "N/A"
-
-            name_text = name.text.strip() if name and name.text.strip() else "N/A"
-            if name_text != "N/A":
-                name_text = re.sub(r'\s*\(YC S25\)', '', name_text).strip()
-            desc_text = description.text.strip() if description and description.text.strip() else "N/A"
-            href = name.get('href') if name else None
-            link = href if href and href.strip() else "N/A"
-
-            # Check and save new company to database
-            existing_company = await self.company_service.get_by_name(name_text)
-            if not existing_company:
-                await self.company_service.create_new(
-                    name=name_text,
-                    location=location_text if location_text else "N/A",
-                    description=desc_text,
-                    link=link
-                )
-                new_company_count += 1
+        return await self._save(records, "linkedin", on_written)
 
-        return new_company_count
+    async def scroll_and_parse_linkedin(
+        self,
+        page: Page,
+        key: str = "linkedin",
+        checkpoint: Optional[Checkpoint] = None,
+        stop_at_known: bool = False,
+        max_pages: Optional[int] = None
+    ) -> int:
+        """Walk the result pages, parsing and saving each page whose cards changed since the last cycle.
 
-    async def scroll_and_parse_linkedin(self, page: Page) -> int:
-        """Parse LinkedIn content, scroll, and save new companies. Return total new companies."""
+        The page open in `page` is taken to be the one after `checkpoint`. With `stop_at_known`, the
+        walk stops at the first page without new companies, and with `max_pages`, after that page.
+        Return total new companies.
+        """
+        checkpoint = checkpoint or Checkpoint.new_cycle(key)
         total_new_companies = 0
+        page_number = checkpoint.page_number + 1
 
-        # Parse initial content
-        html = await page.content()
-        new_companies = await self.parse_page_linkedin(html)
-        total_new_companies += new_companies
-        logging.info(f"LinkedIn initial parse: found {new_companies} new companies")
-
-        # Scroll until no new content is loaded
         while True:
+            signature = await page.evaluate(LIST_SIGNATURE_JS, LINKEDIN_CARD_CSS)
+            page_key = f"{key}#{page_number}"
+            if self._signatures.get(page_key) == signature:
+                new_companies = 0
+                logging.info(f"LinkedIn page {page_number}: unchanged, skipping parse")
+                position = await page.evaluate(CARD_POSITION_JS, LINKEDIN_CARD_CSS)
+                checkpoint = self._next_checkpoint(checkpoint, CollectedCards("", **position), page_number)
+                await self._after_writes(self._page_written(checkpoint))
+            else:
+                cards = await self._collect_cards(page, LINKEDIN_NEW_CARDS_JS, LINKEDIN_CARD_CSS, "linkedin")
+                checkpoint = self._next_checkpoint(checkpoint, cards, page_number)
+                written = self._page_written(checkpoint, {page_key: signature})
+                if cards.html:
+                    new_companies = await self.parse_page_linkedin(cards.html, written)
+                else:
+                    new_companies = 0
+                    if cards.count:
+                        logging.warning(f"LinkedIn page {page_number}: {cards.count} cards on the page, but none unseen")
+                    await self._after_writes(written)
+                total_new_companies += new_companies
+                logging.info(f"LinkedIn page {page_number}: added {new_companies} new companies")
+            if stop_at_known and new_companies == 0:
+                logging.info(f"LinkedIn [{key}]: no new companies on page {page_number}, stopping early")
+                break
+            if max_pages is not None and page_number >= max_pages:
+                logging.info(f"LinkedIn [{key}]: reached page {max_pages}, stopping")
+                break
+
             await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
             button = page.locator('.artdeco-pagination__button--next')
             if await button.get_attribute('disabled') == '':
-                logging.info("LinkedIn scrolling complete: no new data loaded")
+                logging.info("LinkedIn pagination complete: no more pages")
                 break
-            await button.click()
-            await asyncio.sleep(1)
-
-            html = await page.content()
-            new_companies = await self.parse_page_linkedin(html)
-            total_new_companies += new_companies
-            logging.info(f"LinkedIn scroll: added {new_companies} new companies")
+            await self._throttle(page.url)
+            with timed("linkedin", "scroll_step"):
+                await button.click()
+                # The next page has loaded once the card list differs from the current one
+                await page.wait_for_function(LIST_CHANGED_JS, arg=[LINKEDIN_CARD_CSS, signature], timeout=self.scroll_timeout_ms)
+            if self.incremental:
+                await page.evaluate(CLEAR_MARKERS_JS, [LINKEDIN_CARD_CSS, CARD_MARKER])
+            page_number += 1
 
+        await self._complete_cycle(checkpoint)
         return total_new_companies
 
-    async def parse_linkedin(self) -> None:
-        """Scrape LinkedIn with real-time updates."""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(user_agent=self.user_agent)
-            await context.add_cookies(self.linkedin_cookies)
-            page = await context.new_page()
+    async def parse_linkedin(self, target: CrawlTarget) -> int:
+        """Crawl one LinkedIn company search once, resuming an interrupted cycle. Return total new companies."""
+        checkpoint = await self._start_cycle(target.key)
+        url = self.linkedin_search_url(target.query, checkpoint.page_number + 1)
+        async with self.browser_pool.page(target.key, cookies=self.linkedin_cookies) as page:
+            await self._throttle(url)
+            with timed("linkedin", "goto"):
+                await page.goto(url, wait_until="load", timeout=30000)
+                try:
+                    await page.wait_for_selector(LINKEDIN_CARD_CSS, timeout=self.scroll_timeout_ms)
+                    has_cards = True
+                except PlaywrightTimeoutError:
+                    if checkpoint.page_number == 0:
+                        raise
+                    has_cards = False
 
-            try:
-                while True:
-                    try:
-                        await page.goto(self.linkedin_url, wait_until="load", timeout=30000)
-                        await asyncio.sleep(2)
-                        new_companies = await self.scroll_and_parse_linkedin(page)
-                        logging.info(f"LinkedIn total new companies: {new_companies}")
-                        await asyncio.sleep(30)
-                    except Exception as e:
-                        logging.error(f"LinkedIn error: {e}")
-                        await asyncio.sleep(3)
-            except KeyboardInterrupt:
-                logging.info("LinkedIn scraping stopped by user")
-            finally:
-                await context.close()
-                await browser.close()
\ No newline at end of file
+            if has_cards:
+                new_companies = await self.scroll_and_parse_linkedin(
+                    page, target.key, checkpoint, target.stop_at_known_page, target.max_pages
+                )
+            else:
+                # The result set shrank below the checkpointed page since the cycle was interrupted
+                logging.info(f"LinkedIn [{target.query}]: no results after page {checkpoint.page_number}, cycle complete")
+                await self._complete_cycle(checkpoint)
+                new_companies = 0
+
+        logging.info(f"LinkedIn [{target.query}] total new companies: {new_companies}")
+        self._log_known_index_stats("LinkedIn")
+        return new_companies
+
+    async def crawl(self, target: CrawlTarget) -> int:
+        """Crawl a target once. Return total new companies."""
+        if target.source == "linkedin":
+            return await self.parse_linkedin(target)
+        return await self.parse_ycombinator_site(target)